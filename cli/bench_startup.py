@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+kubeafr Startup Benchmark
+Times `kubeafr <command>` end to end against a bare interpreter and fails if the CLI's own
+startup overhead exceeds the budget. Commands run with HOME set to a scratch student environment
+(task workspace, cluster info pointing at a closed local port), so no cluster or network is needed.
+A command's floor is the interpreter plus the stdlib modules its work cannot do without (`status`
+talks to the API server, so its floor imports http.client); the budget applies to the rest
+
+Usage:
+    python3 cli/bench_startup.py [--runs 30] [--budget-ms 25] [--importtime]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+KUBEAFR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kubeafr')
+# Command -> stdlib modules in its floor
+COMMANDS = {
+    'version': (),
+    'help': (),
+    'submit --help': (),
+    'tasks': (),
+    'status': ('http.client',),
+}
+
+
+def student_home(root):
+    """Scratch HOME for `tasks` and `status`: a task workspace and a cluster whose API refuses connections"""
+    for task_id in ('task-01', 'task-02', 'task-03'):
+        os.makedirs(os.path.join(root, 'k8s-workspace', 'tasks', task_id))
+        with open(os.path.join(root, 'k8s-workspace', 'tasks', task_id, 'README.md'), 'w') as f:
+            f.write(f"# {task_id}\n")
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    os.makedirs(os.path.join(root, '.kube-assessment'))
+    with open(os.path.join(root, '.kube-assessment', 'cluster-info.json'), 'w') as f:
+        json.dump({'neptun_code': 'BENCH1', 'task_id': 'task-01', 'public_ip': '127.0.0.1',
+                   'kube_api': f'http://127.0.0.1:{port}', 'kube_token': 'bench'}, f)
+    return dict(os.environ, HOME=root)
+
+
+def median_ms(argv, runs, env=None):
+    """Median wall time of a command in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def import_report(command, env, top=10):
+    """Print the slowest imports (cumulative) for one command"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', KUBEAFR, *command.split()],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=env)
+    rows = []
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line and 'cumulative' not in line:
+            _, cumulative, name = line.split('|')
+            rows.append((int(cumulative), name.rstrip()))
+    print(f"\nSlowest imports for 'kubeafr {command}' (cumulative µs):")
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative:>8}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark kubeafr startup')
+    parser.add_argument('--runs', type=int, default=30, help='Runs per command')
+    parser.add_argument('--budget-ms', type=float, default=25.0, help='Allowed overhead over a bare interpreter')
+    parser.add_argument('--importtime', action='store_true', help='Show the slowest imports per command')
+    args = parser.parse_args()
+
+    floors = {}
+    for modules in set(COMMANDS.values()):
+        code = f"import {', '.join(modules)}" if modules else 'pass'
+        floors[modules] = median_ms([sys.executable, '-c', code], args.runs)
+    print(f"{'Command':<20} {'Median':>9} {'Floor':>9} {'Overhead':>9}")
+
+    worst = 0.0
+    with tempfile.TemporaryDirectory() as home:
+        env = student_home(home)
+        for command, modules in COMMANDS.items():
+            elapsed = median_ms([sys.executable, KUBEAFR, *command.split()], args.runs, env)
+            floor = floors[modules]
+            worst = max(worst, elapsed - floor)
+            print(f"{command:<20} {elapsed:>7.1f}ms {floor:>7.1f}ms {elapsed - floor:>7.1f}ms")
+
+        if args.importtime:
+            for command in COMMANDS:
+                import_report(command, env)
+
+    if worst > args.budget_ms:
+        print(f"\n❌ Startup overhead {worst:.1f}ms exceeds budget {args.budget_ms:.0f}ms")
+        return 1
+    print(f"\n✅ Startup overhead within {args.budget_ms:.0f}ms budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -51,10 +51,11 @@ echo ""
 # Get script directory
 SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 CLI_SOURCE="${SCRIPT_DIR}/kubeafr"
+CLI_PACKAGE="${SCRIPT_DIR}/kubeafr_cli"
 
-# Check if CLI source exists
-if [ ! -f "$CLI_SOURCE" ]; then
-    print_error "CLI source not found: $CLI_SOURCE"
+# Check if CLI source exists (the entry script and the package holding its commands)
+if [ ! -f "$CLI_SOURCE" ] || [ ! -d "$CLI_PACKAGE" ]; then
+    print_error "CLI source not found: $CLI_SOURCE, $CLI_PACKAGE"
     exit 1
 fi
 
@@ -132,6 +133,8 @@ case $CHOICE in
 esac
 
 INSTALL_PATH="${INSTALL_DIR}/kubeafr"
+# The entry script and its kubeafr_cli package live together; INSTALL_PATH links to the script
+LIB_DIR="$(dirname "$INSTALL_DIR")/lib/kubeafr"
 
 # Check if already installed
 if [ -f "$INSTALL_PATH" ]; then
@@ -148,15 +151,21 @@ fi
 echo ""
 print_info "Installing kubeafr to $INSTALL_DIR..."
 
+# Bytecode is compiled at install time: users may not be able to write to LIB_DIR
+SUDO=""
 if [ "$NEEDS_SUDO" = true ]; then
-    sudo cp "$CLI_SOURCE" "$INSTALL_PATH"
-    sudo chmod +x "$INSTALL_PATH"
-else
-    cp "$CLI_SOURCE" "$INSTALL_PATH"
-    chmod +x "$INSTALL_PATH"
+    SUDO="sudo"
 fi
-
-print_success "CLI installed: $INSTALL_PATH"
+$SUDO rm -rf "${LIB_DIR}/kubeafr_cli"
+$SUDO mkdir -p "$LIB_DIR"
+$SUDO cp "$CLI_SOURCE" "${LIB_DIR}/kubeafr"
+$SUDO cp -r "$CLI_PACKAGE" "${LIB_DIR}/kubeafr_cli"
+$SUDO rm -rf "${LIB_DIR}/kubeafr_cli/__pycache__"
+$SUDO chmod +x "${LIB_DIR}/kubeafr"
+$SUDO python3 -m compileall -q "${LIB_DIR}/kubeafr_cli"
+$SUDO ln -sf "${LIB_DIR}/kubeafr" "$INSTALL_PATH"
+
+print_success "CLI installed: $INSTALL_PATH -> ${LIB_DIR}/kubeafr"
 
 # Check if installation directory is in PATH
 if [[ ":$PATH:" != *":$INSTALL_DIR:"* ]]; then
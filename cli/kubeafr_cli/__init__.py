@@ -0,0 +1,58 @@
+"""
+kubeafr - Kubernetes Assessment Framework CLI
+
+A unified command-line interface for the Kubernetes Assessment Framework.
+Provides tools for both instructors and students.
+
+Usage:
+    kubeafr <command> [options]
+
+Commands:
+    Instructor Commands:
+        deploy              Deploy complete assessment infrastructure
+        upload-specs        Upload task specifications to S3
+        view-results        View student evaluation results
+        decode-token        Decode JWT evaluation tokens
+        reupload-template   Re-upload CloudFormation template to S3
+
+    Student Commands:
+        eval                Request evaluation of your current solution
+        submit              Submit your final solution
+        status              Check your current environment status
+        tasks               List available tasks and your progress
+
+    Utility Commands:
+        validate-spec       Validate task specification file
+        list-tasks          List all available tasks
+        check-prereqs       Check deployment prerequisites
+
+    Help:
+        help                Show this help message
+        version             Show version information
+        man                 Show detailed manual page
+
+Examples:
+    # Instructor usage
+    kubeafr deploy                     # Deploy infrastructure
+    kubeafr upload-specs               # Upload task specs
+    kubeafr view-results TEST01        # View student results
+
+    # Student usage
+    kubeafr eval task-01               # Request evaluation for task-01
+    kubeafr eval task-01 --async       # Queue it as a job and wait for the result
+    kubeafr submit task-01             # Submit final solution for task-01
+    kubeafr status                     # Check environment status
+    kubeafr status --watch             # Follow pod/deployment changes live
+
+For detailed help on a command:
+    kubeafr <command> --help
+"""
+
+# Startup stays on the fast path: the `kubeafr` entry script loads only this package and its
+# command table (cli), the chosen command's module is imported when it runs, and each command
+# imports its own dependencies (json, pathlib, subprocess, http.client, argparse...) inside it
+import os
+
+VERSION = "4.0.0"
+FRAMEWORK_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+USAGE = __doc__
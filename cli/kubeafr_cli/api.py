@@ -0,0 +1,201 @@
+"""Assessment API client: keep-alive JSON requests, retries and streamed evaluation progress"""
+
+import sys
+
+from .console import Colors
+
+
+class ApiError(Exception):
+    """Request to the assessment API that failed without an HTTP response"""
+
+
+class ApiClient:
+    """Keep-alive JSON client for the assessment API (stdlib only, no curl processes)"""
+
+    # Idempotent requests (job polls) are retried on throttling and any 5xx gateway error; requests
+    # that start an evaluation or record a submission only when the server did not act on them
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    NON_IDEMPOTENT_RETRY_STATUSES = {429, 503}
+
+    def __init__(self, api_key: str, retries: int = 3, backoff: float = 1.0):
+        self.api_key = api_key
+        self.retries = retries
+        self.backoff = backoff
+        self.connections = {}
+
+    def connection(self, url, timeout: float):
+        """Reuse one open connection per scheme and host"""
+        import http.client
+
+        key = (url.scheme, url.netloc)
+        conn = self.connections.get(key)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+            conn = conn_class(url.netloc, timeout=timeout)
+            self.connections[key] = conn
+        conn.timeout = timeout
+        if conn.sock:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def drop(self, url):
+        """Close and forget a connection after a transport error"""
+        conn = self.connections.pop((url.scheme, url.netloc), None)
+        if conn:
+            conn.close()
+
+    def post_json(self, endpoint: str, payload: dict, timeout: float = 120, label: str = 'Waiting',
+                  on_event=None, idempotent: bool = False):
+        """
+        POST JSON, retrying throttling/5xx with jittered backoff; returns (status, body).
+        Unless idempotent, only 429/503 and connection errors before the request was sent are
+        retried, so an evaluation or submission is never run twice.
+        With on_event, NDJSON progress streams are accepted: each progress event is passed
+        to on_event as it arrives and the final result line becomes the body.
+        """
+        import http.client
+        import json
+        import random
+        import socket
+        import time
+        from urllib.parse import urlsplit
+
+        url = urlsplit(endpoint)
+        path = (url.path or '/') + (f'?{url.query}' if url.query else '')
+        data = json.dumps(payload).encode()
+        headers = {'Content-Type': 'application/json', 'X-API-Key': self.api_key}
+        if on_event:
+            headers['Accept'] = f'{NDJSON}, application/json'
+
+        retry_statuses = self.RETRY_STATUSES if idempotent else self.NON_IDEMPOTENT_RETRY_STATUSES
+        for attempt in range(self.retries + 1):
+            status, body, retry_after, sent = None, '', None, False
+            conn = self.connection(url, timeout)
+            try:
+                with Progress(label) as progress:
+                    conn.request('POST', path, body=data, headers=headers)
+                    sent = True
+                    resp = conn.getresponse()
+                    if on_event and resp.status == 200 and resp.getheader('Content-Type', '').startswith(NDJSON):
+                        # Streamed evaluation: it has started, so it is never retried from here
+                        return read_event_stream(resp, on_event, progress)
+                    body = resp.read().decode('utf-8', errors='replace')
+                status = resp.status
+                retry_after = resp.getheader('Retry-After')
+                if resp.will_close:
+                    self.drop(url)
+            except socket.timeout:
+                # Not retried: a timed-out evaluation would only be started again
+                self.drop(url)
+                raise ApiError(f"Request timed out after {timeout:.0f} seconds")
+            except (http.client.HTTPException, OSError) as e:
+                # Includes keep-alive connections the server closed while idle
+                self.drop(url)
+                if sent and not idempotent:
+                    # The server may have acted on the request: retrying could run it twice
+                    raise ApiError(str(e))
+                error = e
+
+            if status is not None and status not in retry_statuses:
+                return status, body
+            if attempt == self.retries:
+                break
+
+            delay = random.uniform(0, self.backoff * 2 ** attempt)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            reason = f"HTTP {status}" if status is not None else str(error)
+            print(Colors.warning(f"{reason}, retrying in {delay:.1f}s ({attempt + 1}/{self.retries})"))
+            time.sleep(delay)
+
+        if status is not None:
+            return status, body
+        raise ApiError(str(error))
+
+
+NDJSON = 'application/x-ndjson'
+
+
+def read_event_stream(resp, on_event, progress):
+    """Consume an NDJSON evaluation stream; returns (status, body) from its final line"""
+    import json
+
+    status, body = 502, json.dumps({'error': 'Evaluation stream ended without a result'})
+    for line in resp:
+        if not line.strip():
+            continue
+        event = json.loads(line)
+        if event.get('type') in ('result', 'error'):
+            status = event.pop('statusCode', 200)
+            event.pop('type')
+            body = json.dumps(event)
+        else:
+            with progress.lock:
+                if sys.stderr.isatty():
+                    sys.stderr.write('\r\033[K')
+                on_event(event)
+    return status, body
+
+
+class Progress:
+    """Elapsed-time spinner on stderr while a request is in flight (TTY only)"""
+
+    FRAMES = '⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏'
+
+    def __init__(self, label: str):
+        import threading
+
+        self.label = label
+        self.done = threading.Event()
+        self.lock = threading.Lock()  # Serializes the spinner with live output lines
+        self.thread = None
+
+    def __enter__(self):
+        import threading
+
+        if sys.stderr.isatty():
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.thread:
+            self.done.set()
+            self.thread.join()
+            sys.stderr.write('\r\033[K')
+            sys.stderr.flush()
+
+    def run(self):
+        import time
+
+        started = time.monotonic()
+        frame = 0
+        while not self.done.wait(0.1):
+            elapsed = time.monotonic() - started
+            with self.lock:
+                sys.stderr.write(f"\r{Colors.CYAN}{self.FRAMES[frame % len(self.FRAMES)]}{Colors.RESET} "
+                                 f"{self.label}... {elapsed:.0f}s")
+                sys.stderr.flush()
+            frame += 1
+
+
+PHASE_LABELS = {
+    'cached': 'Nothing changed since your last evaluation, reusing its results',
+    'resource_checks': 'Checking Kubernetes resources...',
+    'application_checks': 'Running application checks (starting test-runner)...',
+    'custom_checks': 'Running custom checks...',
+}
+
+
+def render_progress_event(event: dict):
+    """Print one streamed evaluation event as it arrives"""
+    if event.get('type') == 'phase':
+        print(Colors.info(PHASE_LABELS.get(event['phase'], event['phase'])))
+    elif event.get('type') == 'check':
+        result = event.get('result')
+        if isinstance(result, bool):
+            icon = f"{Colors.GREEN}✓{Colors.RESET}" if result else f"{Colors.RED}✗{Colors.RESET}"
+            print(f"  {icon} {event['check_id']}")
+        else:
+            print(f"  · {event['check_id']}: {result}")
+    sys.stdout.flush()
@@ -0,0 +1,114 @@
+"""Command table and argument parsing: everything `kubeafr` loads before the chosen command runs"""
+
+import sys
+
+from .console import Colors
+
+
+# Command table: name -> (handler, help, arguments). The handler is 'module:function' within this package,
+# imported only when its command runs; each argument is (names, argparse keyword arguments), so
+# common invocations never construct an argparse parser
+COMMANDS = {
+    # Instructor commands
+    'deploy': ('instructor:cmd_deploy', 'Deploy assessment infrastructure', ()),
+    'upload-specs': ('instructor:cmd_upload_specs', 'Upload task specifications to S3', ()),
+    'view-results': ('instructor:cmd_view_results', 'View student results', (
+        (('student_id',), {'nargs': '?', 'help': 'Student ID to filter'}),
+    )),
+    'decode-token': ('instructor:cmd_decode_token', 'Decode JWT token', (
+        (('token',), {'help': 'JWT token or file path'}),
+        (('--json',), {'action': 'store_true', 'help': 'Output full JSON'}),
+    )),
+    'reupload-template': ('instructor:cmd_reupload_template', 'Re-upload CloudFormation template', ()),
+
+    # Student commands
+    'eval': ('student:cmd_eval', 'Request evaluation', (
+        (('task_id',), {'nargs': '?', 'help': 'Task ID (e.g., task-01)'}),
+        (('--async',), {'dest': 'queue', 'action': 'store_true',
+                        'help': 'Queue the evaluation as a job and poll for the result'}),
+        (('--job',), {'help': 'Wait for an already queued evaluation job'}),
+    )),
+    'submit': ('student:cmd_submit', 'Submit final solution', (
+        (('task_id',), {'nargs': '?', 'help': 'Task ID (e.g., task-01)'}),
+        (('-y', '--yes'), {'action': 'store_true', 'help': 'Skip confirmation'}),
+    )),
+    'status': ('status:cmd_status', 'Check environment status', (
+        (('-w', '--watch'), {'action': 'store_true', 'help': 'Stream changes until interrupted'}),
+    )),
+    'tasks': ('tasks:cmd_tasks', 'List available tasks', ()),
+
+    # Utility commands
+    'validate-spec': ('utility:cmd_validate_spec', 'Validate task specification', (
+        (('task_id',), {'nargs': '?', 'help': 'Task ID (e.g., task-07)'}),
+    )),
+    'list-tasks': ('utility:cmd_list_tasks', 'List all available tasks', ()),
+    'check-prereqs': ('utility:cmd_check_prereqs', 'Check deployment prerequisites', ()),
+
+    # Help commands
+    'help': ('utility:cmd_help', 'Show help message', ()),
+    'version': ('utility:cmd_version', 'Show version', ()),
+}
+
+
+def handler(command: str):
+    """Import the module that implements a command and return its handler"""
+    from importlib import import_module
+
+    module, function = COMMANDS[command][0].split(':')
+    return getattr(import_module(f'{__package__}.{module}'), function)
+
+
+class Args:
+    """Parsed arguments for one command"""
+
+    def __init__(self, command: str, **values):
+        self.command = command
+        self.__dict__.update(values)
+
+
+def parse_fast(command: str, argv: list):
+    """Bind plain positional arguments without argparse, None if argparse must handle them"""
+    if any(arg.startswith('-') for arg in argv):
+        return None
+
+    values = {}
+    positionals = list(argv)
+    for names, options in COMMANDS[command][2]:
+        dest = options.get('dest', names[-1].lstrip('-').replace('-', '_'))
+        if names[0].startswith('-'):
+            values[dest] = False if options.get('action') == 'store_true' else options.get('default')
+        elif positionals:
+            values[dest] = positionals.pop(0)
+        elif options.get('nargs') == '?':
+            values[dest] = options.get('default')
+        else:
+            return None
+
+    return None if positionals else Args(command, **values)
+
+
+def parse_full(command: str, argv: list):
+    """Parse one command's arguments with argparse (flags, --help and usage errors)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=f'kubeafr {command}', description=COMMANDS[command][1])
+    for names, options in COMMANDS[command][2]:
+        parser.add_argument(*names, **options)
+    return Args(command, **vars(parser.parse_args(argv)))
+
+
+def main():
+    """Main CLI entry point"""
+    argv = sys.argv[1:]
+
+    if not argv or argv[0] in ('-h', '--help'):
+        return handler('help')(Args('help'))
+
+    command = argv[0]
+    if command not in COMMANDS:
+        print(Colors.error(f"Unknown command: {command}"))
+        print("Run 'kubeafr help' for usage information")
+        return 1
+
+    args = parse_fast(command, argv[1:]) or parse_full(command, argv[1:])
+    return handler(command)(args)
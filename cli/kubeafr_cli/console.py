@@ -0,0 +1,46 @@
+"""Terminal output shared by every command"""
+
+class Colors:
+    """ANSI color codes for terminal output"""
+    RESET = '\033[0m'
+    BOLD = '\033[1m'
+    RED = '\033[91m'
+    GREEN = '\033[92m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    MAGENTA = '\033[95m'
+
+    @staticmethod
+    def success(text: str) -> str:
+        return f"{Colors.GREEN}✓{Colors.RESET} {text}"
+
+    @staticmethod
+    def error(text: str) -> str:
+        return f"{Colors.RED}✗{Colors.RESET} {text}"
+
+    @staticmethod
+    def warning(text: str) -> str:
+        return f"{Colors.YELLOW}⚠{Colors.RESET} {text}"
+
+    @staticmethod
+    def info(text: str) -> str:
+        return f"{Colors.BLUE}ℹ{Colors.RESET} {text}"
+
+
+def print_header(text: str):
+    """Print a formatted header"""
+    print(f"\n{Colors.BOLD}{Colors.CYAN}{text}{Colors.RESET}")
+    print("=" * len(text))
+
+
+def print_banner():
+    """Print kubeafr banner"""
+    banner = f"""
+{Colors.CYAN}{Colors.BOLD}
+╦╔═╦ ╦╔╗ ╔═╗╔═╗╔═╗╦═╗
+╠╩╗║ ║╠╩╗║╣ ╠═╣╠╣ ╠╦╝
+╩ ╩╚═╝╚═╝╚═╝╩ ╩╚  ╩╚═
+{Colors.RESET}{Colors.MAGENTA}Kubernetes Assessment Framework{Colors.RESET}
+"""
+    print(banner)
@@ -0,0 +1,105 @@
+"""Kubernetes API client used by `kubeafr status` (only that command loads this module)"""
+
+import http.client
+import threading
+
+from .api import ApiError
+
+
+class KubeClient:
+    """Kubernetes API client over pooled keep-alive connections (stdlib only, no kubectl processes)"""
+
+    def __init__(self, api_url: str, token: str, pool_size: int = 4):
+        from urllib.parse import urlsplit
+
+        self.url = urlsplit(api_url)
+        self.headers = {'Authorization': f'Bearer {token}', 'Accept': 'application/json'}
+        self.pool_size = pool_size
+        self.pool = []
+        self.lock = threading.Lock()
+        self.ssl_context = None
+
+    def connect(self, timeout: float):
+        """Open a connection to the API server (K3s serves a self-signed certificate)"""
+        import ssl
+
+        if self.url.scheme != 'https':
+            return http.client.HTTPConnection(self.url.netloc, timeout=timeout)
+        if self.ssl_context is None:
+            self.ssl_context = ssl._create_unverified_context()
+        return http.client.HTTPSConnection(self.url.netloc, timeout=timeout, context=self.ssl_context)
+
+    def get(self, path: str, timeout: float = 10):
+        """GET an API path on a pooled connection; returns (status, body)"""
+        while True:
+            with self.lock:
+                conn = self.pool.pop() if self.pool else None
+            pooled = conn is not None
+            conn = conn or self.connect(timeout)
+            try:
+                conn.request('GET', path, headers=self.headers)
+                resp = conn.getresponse()
+                body = resp.read().decode('utf-8', errors='replace')
+            except (http.client.HTTPException, OSError) as e:
+                # A pooled connection the server closed while idle is retried; a fresh one failing
+                # (e.g. connection refused) is an error
+                conn.close()
+                if not pooled:
+                    raise ApiError(str(e))
+                continue
+
+            with self.lock:
+                if not resp.will_close and len(self.pool) < self.pool_size:
+                    self.pool.append(conn)
+                else:
+                    conn.close()
+            return resp.status, body
+
+    def get_all(self, paths: dict) -> dict:
+        """GET {key: path} concurrently, one thread per pooled connection; returns {key: (status, body)}
+
+        A request that fails without a response maps to (None, error)
+        """
+        results = {}
+        pending = iter(list(paths.items()))
+
+        def worker():
+            for key, path in pending:
+                try:
+                    results[key] = self.get(path)
+                except ApiError as e:
+                    results[key] = None, str(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(min(self.pool_size, len(paths)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def watch(self, path: str, resource_version: str = None, timeout: int = 300):
+        """Yield watch events for a collection on a dedicated streaming connection"""
+        import json
+        from urllib.parse import urlencode
+
+        params = {'watch': '1', 'allowWatchBookmarks': 'true', 'timeoutSeconds': str(timeout)}
+        if resource_version:
+            params['resourceVersion'] = resource_version
+
+        conn = self.connect(timeout + 30)
+        try:
+            conn.request('GET', f'{path}?{urlencode(params)}', headers=self.headers)
+            resp = conn.getresponse()
+            if resp.status != 200:
+                raise ApiError(f"HTTP {resp.status} watching {path}")
+            for line in resp:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            conn.close()
+
+    def close(self):
+        with self.lock:
+            for conn in self.pool:
+                conn.close()
+            self.pool = []
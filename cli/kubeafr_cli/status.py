@@ -0,0 +1,199 @@
+"""`kubeafr status`: environment status straight from the Kubernetes API, optionally watched"""
+
+import sys
+
+from .api import ApiError
+from .console import Colors, print_banner, print_header
+from .kube import KubeClient
+
+
+# Collections shown by `kubeafr status` (roughly what `kubectl get all` lists)
+STATUS_RESOURCES = (
+    ('pod', '/api/v1/namespaces/{namespace}/pods'),
+    ('service', '/api/v1/namespaces/{namespace}/services'),
+    ('deployment', '/apis/apps/v1/namespaces/{namespace}/deployments'),
+    ('statefulset', '/apis/apps/v1/namespaces/{namespace}/statefulsets'),
+    ('daemonset', '/apis/apps/v1/namespaces/{namespace}/daemonsets'),
+    ('job', '/apis/batch/v1/namespaces/{namespace}/jobs'),
+)
+
+
+def resource_summary(kind: str, obj: dict) -> str:
+    """One-line state of a resource, compared between watch events to report real changes"""
+    status = obj.get('status') or {}
+    spec = obj.get('spec') or {}
+
+    if kind == 'node':
+        ready = any(c.get('type') == 'Ready' and c.get('status') == 'True' for c in status.get('conditions', []))
+        return 'Ready' if ready else 'NotReady'
+    if kind == 'pod':
+        containers = status.get('containerStatuses') or []
+        ready = sum(1 for c in containers if c.get('ready'))
+        restarts = sum(c.get('restartCount', 0) for c in containers)
+        reason = status.get('phase', 'Unknown')
+        for container in containers:
+            waiting = (container.get('state') or {}).get('waiting') or {}
+            reason = waiting.get('reason', reason)
+        if obj.get('metadata', {}).get('deletionTimestamp'):
+            reason = 'Terminating'
+        return f"{ready}/{len(spec.get('containers', containers))} {reason}, restarts: {restarts}"
+    if kind in ('deployment', 'statefulset'):
+        return f"{status.get('readyReplicas', 0)}/{spec.get('replicas', 1)} ready"
+    if kind == 'daemonset':
+        return f"{status.get('numberReady', 0)}/{status.get('desiredNumberScheduled', 0)} ready"
+    if kind == 'service':
+        ports = ','.join(f"{port.get('port')}" + (f":{port['nodePort']}" if port.get('nodePort') else '')
+                         + f"/{port.get('protocol', 'TCP')}" for port in spec.get('ports', []))
+        return f"{spec.get('type', 'ClusterIP')} {spec.get('clusterIP', '-')} {ports}"
+    if kind == 'job':
+        return f"{status.get('succeeded', 0)}/{spec.get('completions', 1)} completed"
+    return ''
+
+
+def cmd_status(args):
+    """Check environment status"""
+    import json
+    from pathlib import Path
+
+    print_banner()
+    print_header("Environment Status")
+
+    # Check if running on student instance
+    cluster_info_path = Path.home() / ".kube-assessment" / "cluster-info.json"
+    if not cluster_info_path.exists():
+        print(Colors.error("Not running on a student EC2 instance"))
+        print(Colors.info("This command is only available in the student environment"))
+        return 1
+
+    try:
+        with open(cluster_info_path, 'r') as f:
+            cluster_info = json.load(f)
+    except Exception as e:
+        print(Colors.error(f"Failed to read cluster info: {e}"))
+        return 1
+
+    # Display environment info
+    print(f"\n{Colors.BOLD}Student Information:{Colors.RESET}")
+    print(f"  Neptun Code:  {cluster_info.get('neptun_code')}")
+    print(f"  Task ID:      {cluster_info.get('task_id')}")
+    print(f"  Public IP:    {cluster_info.get('public_ip')}")
+
+    if not cluster_info.get('kube_api') or not cluster_info.get('kube_token'):
+        print(Colors.error("Cluster endpoint or token missing from cluster info"))
+        return 1
+
+    # Query the API server directly: every request shares a small keep-alive pool and runs concurrently
+    task_id = cluster_info.get('task_id')
+    queries = {'health': '/readyz', 'node': '/api/v1/nodes'}
+    if task_id:
+        queries['namespace'] = f'/api/v1/namespaces/{task_id}'
+        queries.update({kind: path.format(namespace=task_id) for kind, path in STATUS_RESOURCES})
+
+    client = KubeClient(cluster_info['kube_api'], cluster_info['kube_token'])
+    results = client.get_all(queries)
+
+    # Latest state per resource, and the list versions a watch continues from
+    seen, versions = {}, {}
+
+    def listed(kind):
+        status, body = results[kind]
+        if status != 200:
+            return []
+        collection = json.loads(body)
+        versions[kind] = collection.get('metadata', {}).get('resourceVersion')
+        rows = []
+        for item in collection.get('items', []):
+            name = f"{kind}/{item['metadata']['name']}"
+            seen[name] = resource_summary(kind, item)
+            rows.append((name, seen[name]))
+        return rows
+
+    # Check K3s status
+    print(f"\n{Colors.BOLD}Kubernetes Cluster:{Colors.RESET}")
+    status, body = results['health']
+    if status == 200:
+        print(Colors.success("K3s cluster is running"))
+    elif status is None:
+        print(Colors.error(f"Failed to check cluster status: {body}"))
+    else:
+        print(Colors.error("K3s cluster not responding"))
+
+    # Check node status
+    for name, state in listed('node'):
+        if state == 'Ready':
+            print(Colors.success(f"Node {name.split('/', 1)[1]} is Ready"))
+        else:
+            print(Colors.warning(f"Node {name.split('/', 1)[1]} status: {state}"))
+
+    # Check resources in task namespace
+    if task_id:
+        print(f"\n{Colors.BOLD}Resources in {task_id} namespace:{Colors.RESET}")
+        rows = [row for kind, _ in STATUS_RESOURCES for row in listed(kind)]
+        if results['namespace'][0] != 200:
+            print(Colors.warning("Namespace doesn't exist"))
+        elif not rows:
+            print(Colors.warning("No resources found"))
+        width = max((len(name) for name, _ in rows), default=0)
+        for name, state in rows:
+            print(f"  {name:<{width}}  {state}")
+
+    if getattr(args, 'watch', False):
+        watched = [('node', '/api/v1/nodes')]
+        if task_id:
+            watched += [(kind, path.format(namespace=task_id)) for kind, path in STATUS_RESOURCES]
+        return watch_status(client, watched, versions, seen)
+
+    client.close()
+    return 0
+
+
+def watch_status(client: KubeClient, watched: list, versions: dict, seen: dict) -> int:
+    """Stream resource changes until interrupted, one watch connection per collection"""
+    import http.client
+    import threading
+    import time
+
+    print(f"\n{Colors.BOLD}Watching for changes (Ctrl+C to stop)...{Colors.RESET}")
+    lock = threading.Lock()
+
+    def follow(kind, path):
+        resource_version = versions.get(kind)
+        while True:
+            try:
+                for event in client.watch(path, resource_version):
+                    obj = event.get('object') or {}
+                    if event.get('type') == 'ERROR':
+                        # 410 Gone: the version expired; a fresh watch replays current objects as ADDED
+                        resource_version = None
+                        break
+                    resource_version = obj.get('metadata', {}).get('resourceVersion', resource_version)
+                    if event.get('type') == 'BOOKMARK':
+                        continue
+
+                    name = f"{kind}/{obj['metadata']['name']}"
+                    if event.get('type') == 'DELETED':
+                        state = 'deleted'
+                        seen.pop(name, None)
+                    else:
+                        state = resource_summary(kind, obj)
+                        if seen.get(name) == state:
+                            continue
+                        seen[name] = state
+                    with lock:
+                        print(f"  {time.strftime('%H:%M:%S')}  {name}  {state}")
+                        sys.stdout.flush()
+            except (ApiError, http.client.HTTPException, OSError, ValueError) as e:
+                with lock:
+                    print(Colors.warning(f"Watch on {kind}s interrupted ({e}), reconnecting"))
+                time.sleep(2)
+
+    for kind, path in watched:
+        threading.Thread(target=follow, args=(kind, path), daemon=True).start()
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print()
+        client.close()
+        return 0
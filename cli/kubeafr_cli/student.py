@@ -0,0 +1,278 @@
+"""Student commands: request an evaluation and submit the final solution"""
+
+import os
+
+from .api import ApiClient, ApiError, render_progress_event
+from .console import Colors, print_banner, print_header
+
+
+def cmd_eval(args):
+    """Request evaluation of current solution"""
+    import json
+    import time
+    from pathlib import Path
+
+    print_banner()
+    print_header("Requesting Evaluation")
+
+    if not args.task_id:
+        print(Colors.error("Task ID required"))
+        print("Usage: kubeafr eval <task-id>")
+        print("Example: kubeafr eval task-01")
+        return 1
+
+    task_id = args.task_id
+
+    # Load cluster info
+    cluster_info_path = Path.home() / ".kube-assessment" / "cluster-info.json"
+    if not cluster_info_path.exists():
+        print(Colors.error("Cluster info not found"))
+        print(Colors.info("Are you running this on a student EC2 instance?"))
+        return 1
+
+    try:
+        with open(cluster_info_path, 'r') as f:
+            cluster_info = json.load(f)
+    except Exception as e:
+        print(Colors.error(f"Failed to read cluster info: {e}"))
+        return 1
+
+    neptun_code = cluster_info.get('neptun_code')
+    kube_api = cluster_info.get('kube_api')
+    kube_token = cluster_info.get('kube_token')
+    public_ip = cluster_info.get('public_ip')
+
+    print(Colors.info(f"Student: {neptun_code}"))
+    print(Colors.info(f"Task: {task_id}"))
+    print()
+
+    # Prepare request payload
+    payload = {
+        'student_id': neptun_code,
+        'task_id': task_id,
+        'cluster_endpoint': kube_api,
+        'cluster_token': kube_token,
+        'public_ip': public_ip
+    }
+
+    # Get evaluation endpoint and API key from environment
+    eval_endpoint = os.environ.get('EVAL_ENDPOINT')
+    api_key = os.environ.get('API_KEY')
+
+    if not eval_endpoint or not api_key:
+        print(Colors.error("Evaluation endpoint or API key not configured"))
+        print(Colors.info("These should be set during EC2 initialization"))
+        return 1
+
+    client = ApiClient(api_key)
+    try:
+        if args.job:
+            print(Colors.info(f"Waiting for evaluation job {args.job}..."))
+            http_code, body = wait_for_job(client, eval_endpoint, {'job_id': args.job}, task_id)
+        elif args.queue:
+            # Queued job: the request returns at once with a job ID, then the result is long-polled
+            print(Colors.info("Queueing evaluation..."))
+            http_code, body = request_evaluation(client, eval_endpoint, dict(payload, **{'async': True}), task_id)
+        else:
+            print(Colors.info("Sending evaluation request..."))
+            # A streaming deployment (stream_server.py) reports each check live; the regular
+            # endpoint answers with plain JSON and is rendered when the evaluation finishes
+            eval_endpoint = os.environ.get('EVAL_STREAM_ENDPOINT') or eval_endpoint
+            http_code, body = request_evaluation(client, eval_endpoint, payload, task_id,
+                                                 on_event=render_progress_event)
+
+        if http_code == 200:
+            try:
+                response = json.loads(body)
+                print()
+                print(Colors.success("Evaluation complete!"))
+                print()
+
+                # Display results
+                score = response.get('score', 0)
+                max_score = response.get('max_score', 100)
+                status = response.get('status', 'unknown')
+
+                print(f"{Colors.BOLD}Score:{Colors.RESET}  {score}/{max_score} ({int(score/max_score*100)}%)")
+                print(f"{Colors.BOLD}Status:{Colors.RESET} {status}")
+
+                # Display evaluation details
+                results = response.get('results', {})
+                if results:
+                    print(f"\n{Colors.BOLD}Detailed Results:{Colors.RESET}")
+                    for criterion, result in sorted(results.items()):
+                        status_icon = f"{Colors.GREEN}✓{Colors.RESET}" if result else f"{Colors.RED}✗{Colors.RESET}"
+                        print(f"  {status_icon} {criterion}")
+
+                # Save response
+                timestamp = int(time.time())
+                result_file = Path.home() / f"evaluation-results-{task_id}-{timestamp}.json"
+                with open(result_file, 'w') as f:
+                    json.dump(response, f, indent=2)
+
+                print()
+                print(Colors.info(f"Results saved to: {result_file}"))
+
+                return 0
+
+            except json.JSONDecodeError as e:
+                print(Colors.error(f"Invalid JSON response: {e}"))
+                print(body)
+                return 1
+        else:
+            print(Colors.error(f"Evaluation failed (HTTP {http_code})"))
+            print(body)
+            return 1
+
+    except Exception as e:
+        print(Colors.error(f"Request failed: {e}"))
+        return 1
+
+
+# Queued evaluation jobs: seconds each long poll waits server-side, and how long to keep polling
+JOB_POLL_WAIT = 20
+JOB_TIMEOUT = 900
+
+
+def request_evaluation(client, endpoint, payload, task_id, on_event=None):
+    """POST an evaluation; if the evaluator queued it as a job (HTTP 202), poll until it finishes"""
+    import json
+
+    http_code, body = client.post_json(endpoint, payload, timeout=120, label='Evaluating', on_event=on_event)
+    if http_code != 202:
+        return http_code, body
+
+    job = json.loads(body)
+    print(Colors.info(f"Evaluation queued as job {job['job_id']}"))
+    return wait_for_job(client, endpoint, job, task_id)
+
+
+def wait_for_job(client, endpoint, job, task_id):
+    """Long-poll a queued evaluation job until it finishes; returns its (status, body)"""
+    import json
+    import time
+
+    status = job.get('status')
+    deadline = time.monotonic() + JOB_TIMEOUT
+    while time.monotonic() < deadline:
+        http_code, body = client.post_json(endpoint, {'job_id': job['job_id'], 'wait': JOB_POLL_WAIT},
+                                           timeout=JOB_POLL_WAIT + 30, label=f"Evaluating ({status or 'queued'})",
+                                           idempotent=True)
+        if http_code != 202:
+            return http_code, body
+        current = json.loads(body).get('status')
+        if current != status:
+            status = current
+            print(Colors.info(f"Job {status}"))
+
+    raise ApiError(f"Evaluation job {job['job_id']} did not finish within {JOB_TIMEOUT // 60} minutes; "
+                   f"check again with: kubeafr eval {task_id} --job {job['job_id']}")
+
+
+def cmd_submit(args):
+    """Submit final solution"""
+    import json
+    from pathlib import Path
+
+    print_banner()
+    print_header("Submitting Final Solution")
+
+    if not args.task_id:
+        print(Colors.error("Task ID required"))
+        print("Usage: kubeafr submit <task-id>")
+        print("Example: kubeafr submit task-01")
+        return 1
+
+    task_id = args.task_id
+
+    print(Colors.warning("This will submit your current solution as final."))
+
+    if not args.yes:
+        confirm = input(f"{Colors.YELLOW}Are you sure? (yes/no):{Colors.RESET} ")
+        if confirm.lower() != 'yes':
+            print(Colors.info("Submission cancelled"))
+            return 0
+
+    # Load cluster info
+    cluster_info_path = Path.home() / ".kube-assessment" / "cluster-info.json"
+    if not cluster_info_path.exists():
+        print(Colors.error("Cluster info not found"))
+        return 1
+
+    try:
+        with open(cluster_info_path, 'r') as f:
+            cluster_info = json.load(f)
+    except Exception as e:
+        print(Colors.error(f"Failed to read cluster info: {e}"))
+        return 1
+
+    neptun_code = cluster_info.get('neptun_code')
+    kube_api = cluster_info.get('kube_api')
+    kube_token = cluster_info.get('kube_token')
+    public_ip = cluster_info.get('public_ip')
+
+    # Get endpoints from environment
+    eval_endpoint = os.environ.get('EVAL_ENDPOINT')
+    submit_endpoint = os.environ.get('SUBMIT_ENDPOINT')
+    api_key = os.environ.get('API_KEY')
+
+    if not all([eval_endpoint, submit_endpoint, api_key]):
+        print(Colors.error("Endpoints or API key not configured"))
+        return 1
+
+    print(Colors.info("Running final evaluation..."))
+
+    # First, run evaluation to get eval_token
+    eval_payload = {
+        'student_id': neptun_code,
+        'task_id': task_id,
+        'cluster_endpoint': kube_api,
+        'cluster_token': kube_token,
+        'public_ip': public_ip
+    }
+
+    # One client: the evaluation and submission share a kept-alive connection to the API
+    client = ApiClient(api_key)
+    try:
+        http_code, body = request_evaluation(client, eval_endpoint, eval_payload, task_id)
+
+        eval_response = json.loads(body)
+        eval_token = eval_response.get('eval_token')
+
+        if not eval_token:
+            print(Colors.error("Failed to get evaluation token"))
+            print(json.dumps(eval_response, indent=2))
+            return 1
+
+        print(Colors.success(f"Evaluation token received (score: {eval_response.get('score')}/{eval_response.get('max_score')})"))
+
+        # Now submit with the eval_token
+        print(Colors.info("Submitting final results..."))
+
+        submit_payload = {
+            'student_id': neptun_code,
+            'task_id': task_id,
+            'eval_token': eval_token
+        }
+
+        http_code, body = client.post_json(submit_endpoint, submit_payload, timeout=60, label='Submitting')
+
+        if http_code == 200:
+            submit_response = json.loads(body)
+            print()
+            print(Colors.success("Submission successful!"))
+            print(Colors.info("Your results have been submitted to the instructor."))
+            print()
+            print(f"{Colors.BOLD}Student ID:{Colors.RESET}  {neptun_code}")
+            print(f"{Colors.BOLD}Task ID:{Colors.RESET}     {task_id}")
+            print(f"{Colors.BOLD}Score:{Colors.RESET}       {eval_response.get('score')}/{eval_response.get('max_score')}")
+            print(f"{Colors.BOLD}Timestamp:{Colors.RESET}   {submit_response.get('timestamp')}")
+            return 0
+        else:
+            print(Colors.error(f"Submission failed (HTTP {http_code})"))
+            print(body)
+            return 1
+
+    except Exception as e:
+        print(Colors.error(f"Submission failed: {e}"))
+        return 1
@@ -0,0 +1,58 @@
+"""`kubeafr tasks`: tasks in the student workspace"""
+
+from .console import Colors, print_banner, print_header
+
+
+def cmd_tasks(args):
+    """List available tasks"""
+    import json
+    from pathlib import Path
+
+    print_banner()
+    print_header("Available Tasks")
+
+    # Check if running on student instance
+    cluster_info_path = Path.home() / ".kube-assessment" / "cluster-info.json"
+    if cluster_info_path.exists():
+        try:
+            with open(cluster_info_path, 'r') as f:
+                cluster_info = json.load(f)
+                current_task = cluster_info.get('task_id')
+                print(Colors.info(f"Your assigned task: {Colors.BOLD}{current_task}{Colors.RESET}"))
+                print()
+        except:
+            pass
+
+    # List tasks from local workspace
+    workspace = Path.home() / "k8s-workspace" / "tasks"
+    if workspace.exists():
+        tasks = sorted([d for d in workspace.iterdir() if d.is_dir() and d.name.startswith('task-')])
+
+        for task_dir in tasks:
+            task_id = task_dir.name
+            readme = task_dir / "README.md"
+
+            if readme.exists():
+                # Extract task name from README
+                try:
+                    with open(readme, 'r') as f:
+                        first_line = f.readline().strip()
+                        if first_line.startswith('#'):
+                            task_name = first_line.lstrip('#').strip()
+                        else:
+                            task_name = task_id
+                except:
+                    task_name = task_id
+
+                icon = f"{Colors.GREEN}▸{Colors.RESET}"
+                print(f"{icon} {Colors.BOLD}{task_id}{Colors.RESET}: {task_name}")
+            else:
+                print(f"  {task_id}")
+
+        print()
+        print(Colors.info(f"Total: {len(tasks)} tasks available"))
+    else:
+        print(Colors.warning("Tasks workspace not found"))
+        print(Colors.info("Tasks are typically in ~/k8s-workspace/tasks/"))
+
+    return 0
@@ -0,0 +1,154 @@
+"""Utility and help commands"""
+
+from . import FRAMEWORK_ROOT, USAGE, VERSION
+from .console import Colors, print_banner, print_header
+from .instructor import run_script
+
+
+def cmd_validate_spec(args):
+    """Validate task specification file"""
+    from pathlib import Path
+
+    print_header("Task Specification Validator")
+
+    if not args.task_id:
+        print(Colors.error("Task ID required"))
+        print("Usage: kubeafr validate-spec <task-id>")
+        return 1
+
+    task_id = args.task_id
+    spec_path = Path(FRAMEWORK_ROOT) / "tasks" / task_id / "task-spec.yaml"
+
+    if not spec_path.exists():
+        print(Colors.error(f"Task spec not found: {spec_path}"))
+        return 1
+
+    print(Colors.info(f"Validating: {spec_path}"))
+
+    # Load and validate YAML
+    try:
+        import yaml
+        with open(spec_path, 'r') as f:
+            spec = yaml.safe_load(f)
+    except Exception as e:
+        print(Colors.error(f"YAML parsing failed: {e}"))
+        return 1
+
+    # Validate required fields
+    required_fields = ['task_id', 'task_name', 'namespace', 'required_resources', 'scoring']
+    errors = []
+    warnings = []
+
+    for field in required_fields:
+        if field not in spec:
+            errors.append(f"Missing required field: {field}")
+
+    # Validate task_id matches directory
+    if spec.get('task_id') != task_id:
+        errors.append(f"task_id '{spec.get('task_id')}' doesn't match directory '{task_id}'")
+
+    # Validate namespace
+    if spec.get('namespace') != task_id:
+        warnings.append(f"namespace '{spec.get('namespace')}' doesn't match task_id '{task_id}'")
+
+    # Validate scoring
+    if 'scoring' in spec:
+        scoring = spec['scoring']
+        if 'max_score' not in scoring:
+            warnings.append("scoring.max_score not specified (defaults to 100)")
+
+        if 'criteria' not in scoring:
+            errors.append("scoring.criteria is required")
+        else:
+            total_points = sum(c.get('points', 0) for c in scoring['criteria'])
+            max_score = scoring.get('max_score', 100)
+            if total_points != max_score:
+                warnings.append(f"Criteria points ({total_points}) don't sum to max_score ({max_score})")
+
+    # Print results
+    if errors:
+        print(f"\n{Colors.RED}{Colors.BOLD}Errors:{Colors.RESET}")
+        for error in errors:
+            print(f"  {Colors.error(error)}")
+
+    if warnings:
+        print(f"\n{Colors.YELLOW}{Colors.BOLD}Warnings:{Colors.RESET}")
+        for warning in warnings:
+            print(f"  {Colors.warning(warning)}")
+
+    if not errors and not warnings:
+        print(Colors.success("Validation passed!"))
+        return 0
+    elif not errors:
+        print(f"\n{Colors.success('Validation passed with warnings')}")
+        return 0
+    else:
+        print(f"\n{Colors.error('Validation failed')}")
+        return 1
+
+
+def cmd_list_tasks(args):
+    """List all available tasks"""
+    from pathlib import Path
+
+    print_header("Available Tasks")
+
+    tasks_dir = Path(FRAMEWORK_ROOT) / "tasks"
+    if not tasks_dir.exists():
+        print(Colors.error("Tasks directory not found"))
+        return 1
+
+    tasks = sorted([d for d in tasks_dir.iterdir() if d.is_dir() and d.name.startswith('task-')])
+
+    if not tasks:
+        print(Colors.warning("No tasks found"))
+        return 0
+
+    print(f"\n{Colors.BOLD}{'Task ID':<15} {'Task Name':<40} {'Type':<15} {'Spec'}{Colors.RESET}")
+    print("-" * 80)
+
+    for task_dir in tasks:
+        task_id = task_dir.name
+        spec_path = task_dir / "task-spec.yaml"
+
+        if spec_path.exists():
+            try:
+                import yaml
+                with open(spec_path, 'r') as f:
+                    spec = yaml.safe_load(f)
+                task_name = spec.get('task_name', 'N/A')
+                task_type = spec.get('task_type', 'N/A')
+                has_spec = f"{Colors.GREEN}✓{Colors.RESET}"
+            except:
+                task_name = "Error reading spec"
+                task_type = "N/A"
+                has_spec = f"{Colors.RED}✗{Colors.RESET}"
+        else:
+            task_name = "No spec file"
+            task_type = "N/A"
+            has_spec = f"{Colors.RED}✗{Colors.RESET}"
+
+        print(f"{task_id:<15} {task_name:<40} {task_type:<15} {has_spec}")
+
+    print(f"\n{Colors.info(f'Total: {len(tasks)} tasks')}")
+    return 0
+
+
+def cmd_check_prereqs(args):
+    """Check deployment prerequisites"""
+    print_header("Checking Prerequisites")
+    return run_script("check-prerequisites.sh")
+
+
+def cmd_version(args):
+    """Show version information"""
+    print_banner()
+    print(f"Version {VERSION}")
+    print(f"Kubernetes Assessment Framework")
+    return 0
+
+
+def cmd_help(args):
+    """Show help message"""
+    print(USAGE)
+    return 0
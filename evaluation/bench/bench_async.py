@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Sync vs async evaluator benchmark
+Runs TaskEvaluator and AsyncTaskEvaluator against a local fake kube-apiserver
+and reports resource-validation latency for each engine
+
+Usage:
+    python3 evaluation/bench/bench_async.py [--task task-03] [--latency 0.05] [--runs 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / 'evaluation' / 'lambda'))
+
+from fake_apiserver import FakeApiServer, fixtures_from_spec  # noqa: E402
+from evaluator_dynamic import TaskEvaluator, create_k8s_session  # noqa: E402
+from async_evaluator import AsyncTaskEvaluator, create_async_client  # noqa: E402
+
+
+def load_spec(task_id):
+    """Load a task spec without the checks that need a real cluster"""
+    with open(ROOT / 'tasks' / task_id / 'task-spec.yaml') as f:
+        spec = yaml.safe_load(f)
+    spec.pop('application_checks', None)
+    spec.pop('custom_checks', None)
+    return spec
+
+
+def bench_sync(url, spec, runs):
+    timings = []
+    session = create_k8s_session(url, 'bench-token')
+    for _ in range(runs):
+        start = time.perf_counter()
+        evaluator = TaskEvaluator(session, url, 'bench-token', spec['namespace'], spec)
+        evaluator.calculate_score(evaluator.evaluate())
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def bench_async(url, spec, runs):
+    timings = []
+    async with create_async_client(url, 'bench-token') as client:
+        for _ in range(runs):
+            start = time.perf_counter()
+            evaluator = AsyncTaskEvaluator(client, url, 'bench-token', spec['namespace'], spec)
+            evaluator.calculate_score(await evaluator.evaluate())
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p50 = statistics.median(timings) * 1000
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000
+    print(f"{name:<8} p50={p50:8.1f} ms  p95={p95:8.1f} ms  mean={statistics.mean(timings) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sync vs async evaluation engines')
+    parser.add_argument('--task', default='task-03', help='Task ID under tasks/')
+    parser.add_argument('--latency', type=float, default=0.05, help='Per-request apiserver latency (s)')
+    parser.add_argument('--runs', type=int, default=20, help='Evaluations per engine')
+    args = parser.parse_args()
+
+    spec = load_spec(args.task)
+    fixtures = fixtures_from_spec(spec)
+
+    with FakeApiServer(spec['namespace'], fixtures, latency=args.latency) as server:
+        print(f"Task {args.task}, apiserver latency {args.latency * 1000:.0f} ms, {args.runs} runs")
+        # The fake apiserver speaks HTTP/1.1, so httpx falls back to pooled keep-alive connections
+        report('sync', bench_sync(server.url, spec, args.runs))
+        sync_requests = server.request_count
+        report('async', asyncio.run(bench_async(server.url, spec, args.runs)))
+        print(f"API requests: sync={sync_requests} async={server.request_count - sync_requests}")
+
+
+if __name__ == '__main__':
+    main()
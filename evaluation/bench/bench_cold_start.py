@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Evaluator cold-start benchmark
+Times, in fresh interpreters, the import and first-use cost of each heavy dependency and the
+cold-start latency of the evaluator for rejected requests (401, 400) and warmup invocations
+
+Usage:
+    python3 evaluation/bench/bench_cold_start.py [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+LAMBDA_DIR = ROOT / 'evaluation' / 'lambda'
+
+# (name, setup code, timed code): setup runs untimed in the same fresh interpreter
+DEPENDENCIES = (
+    ('boto3', '', 'import boto3'),
+    ('s3 client', 'import boto3', "boto3.client('s3')"),
+    ('requests', '', 'import requests'),
+    ('urllib3', '', 'import urllib3'),
+    ('yaml', '', 'import yaml'),
+    ('jwt', '', 'import jwt'),
+)
+
+# (name, event): each is the first invocation of a freshly imported evaluator
+SCENARIOS = (
+    ('401 bad API key', {'headers': {'x-api-key': 'wrong'}, 'body': '{}'}),
+    ('400 missing params', {'headers': {'x-api-key': 'bench-key'}, 'body': '{}'}),
+    ('warmup', {'warmup': True}),
+)
+
+TIMED = """
+import json, sys, time
+{setup}
+started = time.perf_counter()
+{code}
+print(json.dumps({{'ms': (time.perf_counter() - started) * 1000}}))
+"""
+
+HANDLER = """
+import json, sys, time
+started = time.perf_counter()
+import evaluator_dynamic
+imported = time.perf_counter()
+response = evaluator_dynamic.lambda_handler(json.loads(sys.argv[1]), None)
+finished = time.perf_counter()
+heavy = sorted(name for name in ('boto3', 'requests', 'urllib3', 'yaml', 'jwt') if name in sys.modules)
+print(json.dumps({'import_ms': (imported - started) * 1000, 'handler_ms': (finished - imported) * 1000,
+                  'status': response['statusCode'], 'loaded': heavy}))
+"""
+
+
+def run_fresh(code, *argv):
+    """Run code in a fresh interpreter and return the JSON it prints last"""
+    env = dict(os.environ, API_KEY='bench-key', AWS_DEFAULT_REGION=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'),
+               PYTHONPATH=str(LAMBDA_DIR))
+    result = subprocess.run([sys.executable, '-c', code, *argv], capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark evaluator cold starts')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters per measurement')
+    args = parser.parse_args()
+
+    print(f"Dependency import/init time (median of {args.runs} fresh interpreters)")
+    for name, setup, code in DEPENDENCIES:
+        samples = [run_fresh(TIMED.format(setup=setup, code=code))['ms'] for _ in range(args.runs)]
+        print(f"  {name:<12} {statistics.median(samples):>8.1f} ms")
+
+    print(f"\nEvaluator cold start (median of {args.runs} fresh interpreters)")
+    print(f"  {'Scenario':<20} {'Import':>9} {'Handler':>9} {'Total':>9}  Status  Heavy modules loaded")
+    for name, event in SCENARIOS:
+        runs = [run_fresh(HANDLER, json.dumps(event)) for _ in range(args.runs)]
+        imported = statistics.median(run['import_ms'] for run in runs)
+        handled = statistics.median(run['handler_ms'] for run in runs)
+        total = statistics.median(run['import_ms'] + run['handler_ms'] for run in runs)
+        print(f"  {name:<20} {imported:>7.1f}ms {handled:>7.1f}ms {total:>7.1f}ms  {runs[-1]['status']:>6}  "
+              f"{', '.join(runs[-1]['loaded']) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+End-to-end evaluator benchmark
+Drives lambda_handler for every tasks/*/task-spec.yaml against a fake kube-apiserver and an in-memory
+S3 bucket, and reports latency percentiles, API calls and bytes transferred per evaluation
+
+Usage:
+    python3 evaluation/bench/bench_e2e.py [--latency 0.02] [--runs 10] [--tasks task-01,task-03]
+                                          [--runner persistent|ephemeral|cold] [--error-rate 0.05] [--async]
+                                          [--save bench.json] [--baseline bench.json] [--tolerance 0.25]
+                                          [--log evaluator.log]
+
+With --log, evaluator output (including its metric records) is kept for instructor-tools/metrics-report.py
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import yaml
+from botocore.exceptions import ClientError
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / 'evaluation' / 'lambda'))
+
+from fake_apiserver import FakeApiServer, fixtures_from_spec, test_runner_service  # noqa: E402
+
+STUDENT_ID = 'BENCH01'
+
+# Absolute slack on top of --tolerance so sub-millisecond noise on fast tasks is not a regression
+LATENCY_SLACK_MS = 5.0
+
+
+class NoSuchKey(ClientError):
+    def __init__(self, operation):
+        super().__init__({'Error': {'Code': 'NoSuchKey'}}, operation)
+
+
+class MemoryS3:
+    """In-memory stand-in for the evaluator's S3 client: task specs come from tasks/, writes are kept"""
+
+    class exceptions:
+        NoSuchKey = NoSuchKey
+        ClientError = ClientError
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = 0
+        self.bytes_written = 0
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        self.calls += 1
+        if Key.startswith('task-specs/') and Key not in self.objects:
+            path = ROOT / 'tasks' / Key.split('/')[1] / 'task-spec.yaml'
+            if path.exists():
+                self.objects[Key] = path.read_bytes()
+        if Key not in self.objects:
+            raise NoSuchKey('GetObject')
+        etag = f'"{hash(self.objects[Key]) & 0xffffffff:08x}"'
+        if IfNoneMatch == etag:
+            raise ClientError({'Error': {'Code': '304'}}, 'GetObject')
+        return {'Body': io.BytesIO(self.objects[Key]), 'ETag': etag}
+
+    def put_object(self, Bucket, Key, Body, ContentType=None, IfMatch=None, IfNoneMatch=None):
+        self.calls += 1
+        body = Body.encode() if isinstance(Body, str) else Body
+        self.objects[Key] = body
+        self.bytes_written += len(body)
+        return {}
+
+
+def task_ids(selected):
+    """Task IDs with a task-spec.yaml, optionally limited to a comma-separated selection"""
+    tasks = sorted(path.parent.name for path in (ROOT / 'tasks').glob('*/task-spec.yaml'))
+    if selected:
+        tasks = [task for task in tasks if task in selected.split(',')]
+    return tasks
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def bench_task(evaluator, s3, task_id, args):
+    """Run one warm-up and args.runs timed evaluations of a task; returns its result row"""
+    with open(ROOT / 'tasks' / task_id / 'task-spec.yaml') as f:
+        spec = yaml.safe_load(f)
+    namespace = spec.get('namespace', task_id)
+    fixtures = fixtures_from_spec(spec)
+    if args.runner != 'cold':
+        fixtures['services'].append(test_runner_service(namespace))
+
+    server = FakeApiServer(namespace, fixtures, latency=args.latency, runner_latency=args.runner_latency,
+                           error_rate=args.error_rate, error_match=args.error_match, seed=args.seed)
+    with server:
+        event = {'body': json.dumps({'student_id': STUDENT_ID, 'task_id': task_id,
+                                     'cluster_endpoint': server.url, 'cluster_token': 'bench-token'})}
+        timings, accepts, statuses, scores, max_score = [], [], [], [], None
+        for run in range(args.runs + 1):
+            if run == 1:
+                # The first evaluation loads and compiles the spec; it is not timed
+                server.reset_stats()
+                s3_calls, s3_bytes = s3.calls, s3.bytes_written
+            if args.runner == 'cold':
+                # Every run finds no test-runner yet and takes the one-off pod fallback
+                for kind in ('deployments', 'services'):
+                    fixtures[kind] = [obj for obj in fixtures[kind] if obj['metadata']['name'] != 'test-runner']
+            log = io.StringIO()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(log):
+                response = evaluator.lambda_handler(event, None)
+                accepted = time.perf_counter() - started
+                while response['statusCode'] == 202:
+                    # Queued job: long-poll it the way kubeafr does
+                    poll = {'job_id': json.loads(response['body'])['job_id'], 'wait': '20'}
+                    response = evaluator.lambda_handler({'queryStringParameters': poll}, None)
+            elapsed = time.perf_counter() - started
+            if args.verbose:
+                print(log.getvalue())
+            if args.log:
+                with open(args.log, 'a') as f:
+                    f.write(log.getvalue())
+            if run:
+                timings.append(elapsed * 1000)
+                accepts.append(accepted * 1000)
+                statuses.append(response['statusCode'])
+            body = json.loads(response['body'])
+            if run and response['statusCode'] == 200:
+                scores.append(body['score'])
+                max_score = body['max_score']
+
+        stats = server.stats()
+
+    runs = args.runs
+    return {
+        'task_id': task_id,
+        'p50_ms': statistics.median(timings),
+        'p95_ms': percentile(timings, 0.95),
+        # Time to the first response: the 202 for queued jobs, the whole evaluation otherwise
+        'accept_ms': statistics.median(accepts),
+        'api_calls': stats['requests'] / runs,
+        'kb_received': stats['bytes_sent'] / runs / 1024,
+        'kb_sent': stats['bytes_received'] / runs / 1024,
+        's3_calls': (s3.calls - s3_calls) / runs,
+        's3_kb_written': (s3.bytes_written - s3_bytes) / runs / 1024,
+        'errors_injected': stats['errors_injected'],
+        'failed_runs': sum(1 for status in statuses if status != 200),
+        # Lowest score seen: injected errors show up as failed checks, not only as failed requests
+        'score': f"{min(scores)}/{max_score}" if scores else None,
+        'calls': {route: count / runs for route, count in sorted(stats['calls'].items())},
+    }
+
+
+def print_rows(rows, show_calls, show_accept=False):
+    print(f"{'Task':<9} {'p50':>8} {'p95':>8} " + (f"{'Accept':>8} " if show_accept else "")
+          + f"{'API':>6} {'KB in':>7} {'KB out':>7} {'S3':>4} {'S3 KB':>6} {'Err':>4} {'Fail':>4}  Score")
+    for row in rows:
+        print(f"{row['task_id']:<9} {row['p50_ms']:>6.1f}ms {row['p95_ms']:>6.1f}ms "
+              + (f"{row['accept_ms']:>6.1f}ms " if show_accept else "")
+              + f"{row['api_calls']:>6.1f} {row['kb_received']:>7.1f} {row['kb_sent']:>7.1f} {row['s3_calls']:>4.0f} "
+              f"{row['s3_kb_written']:>6.1f} {row['errors_injected']:>4} {row['failed_runs']:>4}  {row['score']}")
+        if show_calls:
+            for route, count in row['calls'].items():
+                print(f"            {count:>6.1f}  {route}")
+
+
+def regressions(rows, baseline, tolerance):
+    """Tasks whose latency or API call count grew beyond the tolerance over a saved baseline"""
+    previous = {row['task_id']: row for row in baseline.get('tasks', [])}
+    found = []
+    for row in rows:
+        before = previous.get(row['task_id'])
+        if not before:
+            continue
+        if row['api_calls'] > before['api_calls'] * (1 + tolerance):
+            found.append(f"{row['task_id']}: API calls {before['api_calls']:.1f} -> {row['api_calls']:.1f}")
+        for key in ('p50_ms', 'p95_ms'):
+            if row[key] > before[key] * (1 + tolerance) + LATENCY_SLACK_MS:
+                found.append(f"{row['task_id']}: {key} {before[key]:.1f} -> {row[key]:.1f}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lambda_handler end to end for every task spec')
+    parser.add_argument('--tasks', help='Comma-separated task IDs (default: all)')
+    parser.add_argument('--runs', type=int, default=10, help='Timed evaluations per task')
+    parser.add_argument('--latency', type=float, default=0.02, help='Per-request apiserver latency (s)')
+    parser.add_argument('--runner-latency', type=float, default=0.05, help='Test-runner check batch time (s)')
+    parser.add_argument('--runner', choices=['persistent', 'ephemeral', 'cold'], default='persistent',
+                        help='persistent: test-runner Service exists; ephemeral: one-off pods; '
+                             'cold: no Service yet (fallback path)')
+    parser.add_argument('--incremental', action='store_true', help='Keep INCREMENTAL_EVAL on (reuse path)')
+    parser.add_argument('--async', dest='jobs', action='store_true',
+                        help='Queue each evaluation as a job on the in-process queue and poll for it')
+    parser.add_argument('--workers', type=int, default=4, help='Job queue workers with --async')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of API requests that fail')
+    parser.add_argument('--error-match', help='Regex on "METHOD path" selecting requests to fail')
+    parser.add_argument('--seed', type=int, default=0, help='Error injection seed')
+    parser.add_argument('--calls', action='store_true', help='Show API calls per route')
+    parser.add_argument('--verbose', action='store_true', help='Show evaluator output')
+    parser.add_argument('--log', help='Write evaluator output to this file')
+    parser.add_argument('--save', help='Write results as JSON')
+    parser.add_argument('--baseline', help='Fail if results regress against a saved JSON')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed regression (fraction)')
+    args = parser.parse_args()
+
+    # Evaluator settings are read at import
+    os.environ.pop('API_KEY', None)
+    os.environ['TEST_RUNNER_MODE'] = 'ephemeral' if args.runner == 'ephemeral' else 'persistent'
+    os.environ['INCREMENTAL_EVAL'] = 'true' if args.incremental else 'false'
+    os.environ.setdefault('GRACEFUL_SHUTDOWN_TIMEOUT', '5')
+    os.environ.setdefault('JWT_SECRET', 'bench-secret-long-enough-for-hs256-keys')
+
+    os.environ['EVAL_MODE'] = 'async' if args.jobs else 'sync'
+    if args.log:
+        open(args.log, 'w').close()
+
+    import evaluator_dynamic
+    s3 = evaluator_dynamic.s3 = MemoryS3()
+    if args.jobs:
+        import evaluation_jobs
+        evaluation_jobs.job_queue = evaluation_jobs.LocalJobQueue(args.workers)
+
+    print(f"apiserver latency {args.latency * 1000:.0f} ms, test-runner {args.runner} "
+          f"({args.runner_latency * 1000:.0f} ms), {args.runs} runs per task"
+          + (f", error rate {args.error_rate:.0%}" if args.error_rate else "")
+          + (f", queued jobs ({args.workers} workers)" if args.jobs else ""))
+    rows = [bench_task(evaluator_dynamic, s3, task_id, args) for task_id in task_ids(args.tasks)]
+    print_rows(rows, args.calls, args.jobs)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'settings': {key: value for key, value in vars(args).items()
+                                    if key not in ('save', 'baseline')}, 'tasks': rows}, f, indent=2)
+        print(f"\nSaved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(rows, json.load(f), args.tolerance)
+        if found:
+            print(f"\n❌ Regressions over {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in found:
+                print(f"   {line}")
+            return 1
+        print(f"\n✅ No regressions over {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Fake kube-apiserver for offline evaluator benchmarks
+Serves namespaced GET/LIST requests from in-memory fixtures with configurable latency, plus what an
+evaluation drives beyond that: pod logs (plain and followed), the test-runner service proxy, one-off
+test-runner pods, pod watches and deletes. Errors can be injected and every call and byte is counted.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# URL resource names -> fixture kinds (same kind names as ClusterSnapshot)
+RESOURCE_KINDS = {
+    'deployments': 'deployments',
+    'statefulsets': 'statefulsets',
+    'services': 'services',
+    'configmaps': 'configmaps',
+    'secrets': 'secrets',
+    'pods': 'pods',
+    'persistentvolumeclaims': 'pvcs',
+}
+
+NAMESPACED_PATH = re.compile(
+    r'^/(?:api/v1|apis/apps/v1)/namespaces/(?P<namespace>[^/]+)'
+    r'(?:/(?P<resource>[a-z]+)(?:/(?P<name>[^/]+)(?:/(?P<subresource>log|proxy/run))?)?)?$'
+)
+
+# Labels the evaluator puts on its own objects (test-runner pods, Deployment and Service)
+MANAGED_LABELS = {'app.kubernetes.io/managed-by': 'k8s-assessment'}
+
+# Followed log streams end this long after their last line (a real apiserver keeps them open)
+FOLLOW_IDLE_SECONDS = 0.5
+FOLLOW_MAX_SECONDS = 60
+
+
+def fixtures_from_spec(task_spec):
+    """Build fixtures for a namespace that fully satisfies a task spec's resource checks"""
+    required = task_spec.get('required_resources', {})
+    probes = {}
+    for check in task_spec.get('probe_checks', []):
+        probe = {'httpGet': {'path': check.get('path', '/')}}
+        if 'period_seconds' in check:
+            probe['periodSeconds'] = check['period_seconds']
+        if 'failure_threshold' in check:
+            probe['failureThreshold'] = check['failure_threshold']
+        probes.setdefault(check.get('deployment'), {})[f"{check.get('probe_type')}Probe"] = probe
+
+    fixtures = {kind: [] for kind in RESOURCE_KINDS.values()}
+    fixtures.update(logs={}, prestop=[])
+    version = iter(range(1, 1_000_000))
+
+    def meta(name, labels=None):
+        return {'name': name, 'namespace': task_spec.get('namespace'),
+                'labels': dict(labels or {}), 'resourceVersion': str(next(version))}
+
+    def pod(name, labels):
+        fixtures['logs'][name] = [f'{name} started', 'GET /healthz 200']
+        return {'metadata': meta(name, labels), 'status': {'phase': 'Running'}}
+
+    for spec in required.get('deployments', []):
+        labels = spec.get('selector_labels', {})
+        container_spec = (spec.get('containers') or [{}])[0]
+        container = {
+            'name': container_spec.get('name', spec['name']),
+            'image': f"{container_spec.get('image_pattern', spec['name'])}:latest",
+            'resources': {'limits': {'cpu': '100m', 'memory': '64Mi'}},
+        }
+        container.update(probes.get(spec['name'], {}))
+        if spec.get('startup_probe', {}).get('required'):
+            container.setdefault('startupProbe', {'httpGet': {'path': '/'}})
+        if spec.get('liveness_probe', {}).get('required'):
+            container.setdefault('livenessProbe', {'httpGet': {'path': '/'}})
+        fixtures['deployments'].append({
+            'metadata': meta(spec['name'], labels),
+            'spec': {
+                'replicas': spec.get('replicas', 1),
+                'template': {'metadata': {'labels': labels}, 'spec': {'containers': [container]}},
+            },
+        })
+        for i in range(spec.get('replicas', 1)):
+            fixtures['pods'].append(pod(f"{spec['name']}-{i:05d}", labels))
+
+    for spec in required.get('statefulsets', []):
+        labels = spec.get('selector_labels', {})
+        replicas = spec.get('replicas', 1)
+        templates = [{'metadata': {'name': t.get('name', 'data')}}
+                     for t in spec.get('volumeClaimTemplates', [])]
+        fixtures['statefulsets'].append({
+            'metadata': meta(spec['name'], labels),
+            'spec': {'replicas': replicas, 'volumeClaimTemplates': templates},
+        })
+        for i in range(replicas):
+            fixtures['pods'].append(pod(f"{spec['name']}-{i}", labels))
+            for template in templates:
+                claim = f"{template['metadata']['name']}-{spec['name']}-{i}"
+                fixtures['pvcs'].append({'metadata': meta(claim), 'status': {'phase': 'Bound'}})
+
+    for spec in required.get('services', []):
+        svc_spec = {'type': spec.get('type', 'ClusterIP'), 'clusterIP': spec.get('clusterIP', '10.43.0.10')}
+        fixtures['services'].append({'metadata': meta(spec['name']), 'spec': svc_spec})
+
+    for kind in ('configmaps', 'secrets'):
+        for spec in required.get(kind, []):
+            data = {key: 'dmFsdWU=' for key in spec.get('required_keys', [])}
+            fixtures[kind].append({'metadata': meta(spec['name']), 'data': data})
+
+    # Graceful shutdown: deleting a frontend pod makes its preStop hook call the backend
+    for check in task_spec.get('custom_checks', []):
+        if check.get('check_id') == 'graceful_shutdown':
+            fixtures['prestop'].append({'deleted': {'app': 'frontend'}, 'logs_to': {'app': 'backend'},
+                                        'line': check.get('marker', 'POST /game-over')})
+
+    for kind in RESOURCE_KINDS.values():
+        fixtures[kind].sort(key=lambda obj: obj['metadata']['name'])
+    return fixtures
+
+
+def test_runner_service(namespace):
+    """The persistent test-runner Service, as the evaluator creates it"""
+    labels = {'app': 'test-runner', **MANAGED_LABELS}
+    return {'metadata': {'name': 'test-runner', 'namespace': namespace, 'labels': labels,
+                         'resourceVersion': '1'},
+            'spec': {'type': 'ClusterIP', 'clusterIP': '10.43.0.99'}}
+
+
+def labels_match(obj, labels):
+    obj_labels = obj.get('metadata', {}).get('labels', {})
+    return all(obj_labels.get(k) == v for k, v in labels.items())
+
+
+class FakeApiServer:
+    """In-process kube-apiserver stand-in serving one namespace over HTTP/1.1 keep-alive
+
+    latency          seconds added to every request
+    runner_latency   seconds the test-runner takes to run a check batch (proxy or one-off pod)
+    error_rate       fraction of requests answered with error_status instead (seeded, reproducible)
+    error_match      regex on "METHOD path" limiting which requests errors are injected into
+    failing_checks   application check ids the test-runner reports as failed
+    """
+
+    def __init__(self, namespace, fixtures, latency=0.0, host='127.0.0.1', port=0, runner_latency=0.0,
+                 error_rate=0.0, error_status=503, error_match=None, failing_checks=(), seed=0):
+        self.namespace = namespace
+        self.fixtures = fixtures
+        self.latency = latency
+        self.runner_latency = runner_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.error_match = re.compile(error_match) if error_match else None
+        self.failing_checks = set(failing_checks)
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self.reset_stats()
+        self._lock = threading.Lock()
+        self._replacements = iter(range(1, 1_000_000))
+        self._logs = {name: [(0.0, line) for line in lines]
+                      for name, lines in fixtures.get('logs', {}).items()}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        """Zero the per-route call counts and byte counters"""
+        self.calls = Counter()
+        self.errors_injected = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def stats(self):
+        """Snapshot of calls ("METHOD route" -> count), injected errors and bytes in each direction"""
+        return {'requests': sum(self.calls.values()), 'calls': dict(self.calls),
+                'errors_injected': self.errors_injected,
+                'bytes_sent': self.bytes_sent, 'bytes_received': self.bytes_received}
+
+    def count(self, method, match, received):
+        route = 'other'
+        if match:
+            route = match['resource'] or 'namespace'
+            if match['subresource']:
+                route += '/' + match['subresource']
+            elif match['name']:
+                route += '/{name}'
+        with self._lock:
+            self.request_count += 1
+            self.calls[f'{method} {route}'] += 1
+            self.bytes_received += received
+
+    def inject_error(self, method, path):
+        """Whether this request gets an injected error"""
+        if not self.error_rate:
+            return False
+        if self.error_match and not self.error_match.search(f'{method} {path}'):
+            return False
+        with self._lock:
+            if self.random.random() >= self.error_rate:
+                return False
+            self.errors_injected += 1
+            return True
+
+    def items(self, kind):
+        return self.fixtures.setdefault(kind, [])
+
+    def find(self, kind, name):
+        for item in self.items(kind):
+            if item['metadata']['name'] == name:
+                return item
+        return None
+
+    def append_log(self, pod_name, line):
+        with self._lock:
+            self._logs.setdefault(pod_name, []).append((time.monotonic(), line))
+
+    def log_lines(self, pod_name, since=None, start=0):
+        """A pod's log lines from index start, optionally only those logged at or after since"""
+        with self._lock:
+            return [line for at, line in self._logs.get(pod_name, [])[start:] if since is None or at >= since]
+
+    def handle_get(self, path, query=None):
+        """Resolve a GET path to (status, body)"""
+        query = query or {}
+        match = NAMESPACED_PATH.match(path)
+        if not match or match['namespace'] != self.namespace:
+            return 404, not_found()
+
+        if not match['resource']:
+            return 200, {'kind': 'Namespace', 'metadata': {'name': self.namespace}}
+
+        kind = RESOURCE_KINDS.get(match['resource'])
+        if match['subresource'] == 'log':
+            if not self.find('pods', match['name']):
+                return 404, not_found()
+            since = None
+            if 'sinceSeconds' in query:
+                since = time.monotonic() - int(query['sinceSeconds'])
+            return 200, ''.join(f'{line}\n' for line in self.log_lines(match['name'], since))
+
+        if match['name']:
+            item = self.find(kind, match['name'])
+            return (200, item) if item else (404, not_found())
+
+        items = self.items(kind)
+        if 'labelSelector' in query:
+            selector = dict(term.split('=', 1) for term in query['labelSelector'].split(','))
+            items = [item for item in items if labels_match(item, selector)]
+        return 200, {'kind': 'List', 'metadata': {'resourceVersion': '1'}, 'items': items}
+
+    def handle_post(self, path, body):
+        """Resolve a POST (object creation or a test-runner check batch) to (status, body)"""
+        match = NAMESPACED_PATH.match(path)
+        if not match or match['namespace'] != self.namespace or not match['resource']:
+            return 404, not_found()
+
+        if match['subresource'] == 'proxy/run':
+            # Service proxy to the persistent test-runner: only answers once its Service exists
+            if not self.find('services', 'test-runner'):
+                return 503, {'kind': 'Status', 'code': 503, 'reason': 'ServiceUnavailable'}
+            return 200, {'success': True, 'results': self.run_checks(body.get('checks', []))}
+
+        kind = RESOURCE_KINDS.get(match['resource'])
+        if kind is None or match['name']:
+            return 405, {'kind': 'Status', 'code': 405, 'reason': 'MethodNotAllowed'}
+        if self.find(kind, body.get('metadata', {}).get('name')):
+            return 409, {'kind': 'Status', 'code': 409, 'reason': 'AlreadyExists'}
+
+        obj = dict(body)
+        if kind == 'pods':
+            obj['status'] = self.test_runner_pod_status(obj)
+        self.items(kind).append(obj)
+        return 201, obj
+
+    def handle_delete(self, path):
+        """Delete a pod; pods owned by a workload come back under a new name, as a ReplicaSet would"""
+        match = NAMESPACED_PATH.match(path)
+        if not match or match['namespace'] != self.namespace or match['resource'] != 'pods' or not match['name']:
+            return 405, {'kind': 'Status', 'code': 405, 'reason': 'MethodNotAllowed'}
+
+        pod = self.find('pods', match['name'])
+        if not pod:
+            return 404, not_found()
+        pods = self.items('pods')
+        pods.remove(pod)
+
+        for rule in self.fixtures.get('prestop', []):
+            if labels_match(pod, rule['deleted']):
+                for target in pods:
+                    if labels_match(target, rule['logs_to']):
+                        self.append_log(target['metadata']['name'], rule['line'])
+                        break
+
+        if not labels_match(pod, MANAGED_LABELS):
+            replacement = json.loads(json.dumps(pod))
+            base = pod['metadata']['name'].rsplit('-', 1)[0]
+            replacement['metadata']['name'] = f'{base}-r{next(self._replacements):04d}'
+            pods.append(replacement)
+        return 200, {'kind': 'Status', 'status': 'Success'}
+
+    def run_checks(self, checks):
+        """Test-runner results for a check batch: every check passes unless listed in failing_checks"""
+        if self.runner_latency:
+            time.sleep(self.runner_latency)
+        return {check['check_id']: {'passed': check['check_id'] not in self.failing_checks,
+                                    'check_type': check.get('check_type')} for check in checks}
+
+    def test_runner_pod_status(self, pod):
+        """A one-off test-runner pod has already finished, its result record in the termination message"""
+        container = (pod.get('spec', {}).get('containers') or [{}])[0]
+        env = {var['name']: var.get('value') for var in container.get('env', [])}
+        checks = json.loads(env.get('TEST_SPEC') or '{}').get('checks', [])
+        record = {'success': True, 'results': self.run_checks(checks)}
+        return {'phase': 'Succeeded', 'containerStatuses': [{
+            'name': container.get('name', 'test-runner'),
+            'state': {'terminated': {'exitCode': 0, 'message': json.dumps(record, separators=(',', ':'))}},
+        }]}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def dispatch(self, method):
+                url = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = self.rfile.read(length) if length else b''
+                match = NAMESPACED_PATH.match(url.path)
+                server.count(method, match, len(payload))
+
+                if server.latency:
+                    time.sleep(server.latency)
+                if server.inject_error(method, url.path):
+                    self.send_body(server.error_status, {'kind': 'Status', 'code': server.error_status,
+                                                         'reason': 'InjectedError'})
+                    return
+
+                if method == 'GET' and query.get('watch') in ('1', 'true'):
+                    self.send_watch(url.path, query)
+                elif method == 'GET' and query.get('follow') == 'true' and match and match['subresource'] == 'log':
+                    self.send_followed_log(match['name'])
+                elif method == 'GET':
+                    self.send_body(*server.handle_get(url.path, query))
+                elif method == 'POST':
+                    self.send_body(*server.handle_post(url.path, json.loads(payload or b'{}')))
+                else:
+                    self.send_body(*server.handle_delete(url.path))
+
+            def do_GET(self):
+                self.dispatch('GET')
+
+            def do_POST(self):
+                self.dispatch('POST')
+
+            def do_DELETE(self):
+                self.dispatch('DELETE')
+
+            def send_body(self, status, body):
+                text = isinstance(body, str)
+                payload = body.encode() if text else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain' if text else 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with server._lock:
+                    server.bytes_sent += len(payload)
+
+            def start_stream(self, content_type):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+
+            def send_chunk(self, data):
+                self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+                self.wfile.flush()
+                with server._lock:
+                    server.bytes_sent += len(data)
+
+            def send_watch(self, path, query):
+                """Watch: the current state of each matching object, then the stream closes"""
+                status, body = server.handle_get(path)
+                if status != 200:
+                    self.send_body(status, body)
+                    return
+                name = query.get('fieldSelector', '').partition('metadata.name=')[2]
+                self.start_stream('application/json')
+                for item in body.get('items', []):
+                    if not name or item['metadata']['name'] == name:
+                        self.send_chunk(json.dumps({'type': 'ADDED', 'object': item}).encode() + b'\n')
+                self.send_chunk(b'')
+
+            def send_followed_log(self, pod_name):
+                """follow=true&tailLines=0: stream lines logged from now on"""
+                if not server.find('pods', pod_name):
+                    self.send_body(404, not_found())
+                    return
+                self.start_stream('text/plain')
+                sent = len(server.log_lines(pod_name))
+                started = last = time.monotonic()
+                while time.monotonic() - started < FOLLOW_MAX_SECONDS:
+                    lines = server.log_lines(pod_name, start=sent)
+                    if lines:
+                        sent += len(lines)
+                        last = time.monotonic()
+                        try:
+                            self.send_chunk(''.join(f'{line}\n' for line in lines).encode())
+                        except OSError:
+                            return
+                    elif last > started and time.monotonic() - last > FOLLOW_IDLE_SECONDS:
+                        break
+                    time.sleep(0.01)
+                try:
+                    self.send_chunk(b'')
+                except OSError:
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def not_found():
+    return {'kind': 'Status', 'code': 404, 'reason': 'NotFound'}
@@ -0,0 +1,142 @@
+"""
+Asyncio Evaluation Engine
+Fetches the namespace snapshot over one pooled, kept-alive HTTP/2 client to the kube-apiserver
+Reuses TaskEvaluator's checks, scoring and result keys
+"""
+
+import asyncio
+import httpx
+
+from evaluator_dynamic import (
+    MAX_CONCURRENCY,
+    SNAPSHOT_KINDS,
+    ClusterSnapshot,
+    TaskEvaluator,
+    create_k8s_session,
+)
+from tracing import kube_route, span
+
+
+def create_async_client(endpoint, token, max_connections=MAX_CONCURRENCY):
+    """Create a pooled async client for the K8s API (HTTP/2 multiplexed when the server supports it)"""
+    return httpx.AsyncClient(
+        base_url=endpoint,
+        http2=True,
+        verify=False,
+        timeout=30,
+        headers={
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        },
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    )
+
+
+async def traced_get(client, path):
+    """GET through the async client, recorded as a kube_api span of the current trace"""
+    with span(f'GET {kube_route(path)}', 'kube_api', method='GET', path=path) as attributes:
+        response = await client.get(path)
+        attributes.update(status_code=response.status_code, bytes=len(response.content),
+                          http_version=response.http_version)
+        return response
+
+
+async def test_cluster_connection_async(client, namespace):
+    """Test cluster connectivity"""
+    try:
+        response = await traced_get(client, f'/api/v1/namespaces/{namespace}')
+        if response.status_code == 200:
+            return {'success': True}
+        elif response.status_code == 404:
+            return {'success': False, 'error': f'Namespace {namespace} not found'}
+        elif response.status_code == 401:
+            return {'success': False, 'error': 'Authentication failed'}
+        else:
+            return {'success': False, 'error': f'API error: {response.status_code}'}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+
+async def list_namespaced_async(client, namespace, kind, semaphore):
+    """LIST one resource kind in a namespace, returning its items or None on failure"""
+    path = SNAPSHOT_KINDS[kind].format(namespace=namespace)
+    try:
+        async with semaphore:
+            resp = await traced_get(client, path)
+        if resp.status_code == 200:
+            return resp.json().get('items', [])
+        print(f"Failed to list {kind} (status: {resp.status_code})")
+    except Exception as e:
+        print(f"Error listing {kind}: {e}")
+    return None
+
+
+async def fetch_snapshot_async(client, namespace, kinds, max_workers=MAX_CONCURRENCY):
+    """LIST every requested kind concurrently over the shared client"""
+    semaphore = asyncio.Semaphore(max(max_workers, 1))
+    lists = await asyncio.gather(*[
+        list_namespaced_async(client, namespace, kind, semaphore) for kind in kinds
+    ])
+    return ClusterSnapshot(dict(zip(kinds, lists)))
+
+
+class AsyncTaskEvaluator(TaskEvaluator):
+    """TaskEvaluator whose evaluate() is a coroutine driven by an async K8s client"""
+
+    def __init__(self, client, endpoint, token, namespace, task_spec, session=None,
+                 max_workers=MAX_CONCURRENCY, plan=None, previous=None, on_progress=None):
+        super().__init__(session, endpoint, token, namespace, task_spec, max_workers, plan, previous, on_progress)
+        self.client = client
+
+    async def evaluate(self):
+        """Run complete evaluation"""
+        kinds = self.plan.snapshot_kinds
+        print(f"Fetching namespace snapshot: {', '.join(kinds)}")
+        with span('snapshot', 'phase', kinds=','.join(kinds)):
+            self.snapshot = await fetch_snapshot_async(self.client, self.namespace, kinds, self.max_workers)
+        if self.reuse_unchanged_namespace():
+            return self.results
+
+        print("Starting resource validation...")
+        self.emit_phase('resource_checks')
+        with span('resource_checks', 'phase'):
+            for func, *args in self.resource_checks():
+                self.record(func(*args))
+
+        # Test-runner and custom checks still drive the sync session; keep them off the event loop
+        if self.task_spec.get('application_checks') or self.task_spec.get('custom_checks'):
+            if self.session is None:
+                self.session = create_k8s_session(self.endpoint, self.token)
+
+        if self.task_spec.get('application_checks'):
+            print("Starting application checks...")
+            self.emit_phase('application_checks')
+            with span('application_checks', 'phase'):
+                await asyncio.to_thread(self.run_application_checks)
+
+        if self.task_spec.get('custom_checks'):
+            print("Starting custom checks...")
+            self.emit_phase('custom_checks')
+            with span('custom_checks', 'phase'):
+                await asyncio.to_thread(self.run_custom_checks)
+
+        return self.results
+
+
+async def evaluate_cluster_async(endpoint, token, namespace, task_spec, plan=None, previous=None,
+                                 on_progress=None):
+    """Test connectivity and evaluate over one client, returning (conn_test, evaluator)"""
+    async with create_async_client(endpoint, token) as client:
+        conn_test = await test_cluster_connection_async(client, namespace)
+        if not conn_test['success']:
+            return conn_test, None
+
+        evaluator = AsyncTaskEvaluator(client, endpoint, token, namespace, task_spec, plan=plan, previous=previous,
+                                       on_progress=on_progress)
+        await evaluator.evaluate()
+        return conn_test, evaluator
+
+
+def evaluate_cluster(endpoint, token, namespace, task_spec, plan=None, previous=None, on_progress=None):
+    """Synchronous entry point used by lambda_handler"""
+    return asyncio.run(evaluate_cluster_async(endpoint, token, namespace, task_spec, plan, previous, on_progress))
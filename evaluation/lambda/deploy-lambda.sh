@@ -18,8 +18,14 @@ echo "1. Creating deployment package..."
 # Remove old zip if exists
 rm -f "$ZIP_FILE"
 
-# Create zip with evaluator code
-zip -r "$ZIP_FILE" evaluator_dynamic.py
+# Create zip with evaluator code (evaluator_dynamic.py and its sibling modules), plus their
+# bytecode when this Python matches the python3.11 runtime, so cold starts skip compiling them
+if python3 -c 'import sys; sys.exit(sys.version_info[:2] != (3, 11))'; then
+    python3 -m compileall -q --invalidation-mode checked-hash *.py
+    zip -r "$ZIP_FILE" *.py __pycache__/*.cpython-311.pyc
+else
+    zip -r "$ZIP_FILE" *.py
+fi
 echo "   ✅ Created $ZIP_FILE"
 echo ""
 
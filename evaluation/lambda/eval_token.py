@@ -0,0 +1,72 @@
+"""
+Evaluation Token Claims
+Version 2 (compact) evaluation tokens carry boolean results as presence/pass bitmaps over a spec
+version's result keys, which the evaluator stores once under token-schemas/{task_id}/{spec_hash}.json.
+Shared by the evaluator, which encodes them, and the submitter, kubeafr and decode-jwt-token.py,
+which expand them; the submitter packages this module
+"""
+
+import base64
+
+TOKEN_SCHEMA_PREFIX = 'token-schemas'
+
+
+def token_schema_key(task_id, spec_hash):
+    return f'{TOKEN_SCHEMA_PREFIX}/{task_id}/{spec_hash}.json'
+
+
+def compact_token_claims(student_id, task_id, timestamp, score, max_score, results, plan):
+    """Version 2 token claims: bool results as presence/pass bitmaps indexed by the plan's result keys"""
+    present = passed = 0
+    extras = {}
+    for key, value in results.items():
+        position = plan.result_index.get(key)
+        if position is None:
+            extras[key] = value
+        elif isinstance(value, bool):
+            present |= 1 << position
+            passed |= value << position
+        else:
+            # Non-boolean results (e.g. latencies) are carried by position
+            extras[str(position)] = value
+
+    claims = {'v': 2, 'sid': student_id, 'tid': task_id, 'ts': timestamp, 'sc': score, 'ms': max_score,
+              'sh': plan.spec_hash, 'rp': encode_bitmap(present, len(plan.result_keys)),
+              'rv': encode_bitmap(passed, len(plan.result_keys))}
+    if extras:
+        claims['rx'] = extras
+    return claims
+
+
+def expand_token_claims(claims, result_keys):
+    """Expand version 2 claims into the version 1 payload, given the result keys of their spec version (or None)"""
+    if claims.get('v') != 2:
+        return claims
+
+    present, passed = decode_bitmap(claims['rp']), decode_bitmap(claims['rv'])
+    if result_keys is None:
+        # Schema unavailable: everything but the results
+        present, result_keys = 0, ()
+    elif present >> len(result_keys):
+        raise ValueError(f"Token has results beyond the {len(result_keys)} keys of spec {claims['sh']}")
+
+    results = {key: bool(passed >> position & 1)
+               for position, key in enumerate(result_keys) if present >> position & 1}
+    for key, value in claims.get('rx', {}).items():
+        if not key.isdigit():
+            results[key] = value
+        elif result_keys:
+            results[result_keys[int(key)]] = value
+
+    return {'student_id': claims['sid'], 'task_id': claims['tid'], 'timestamp': claims['ts'],
+            'score': claims['sc'], 'max_score': claims['ms'], 'results': results, 'status': 'completed',
+            'spec_hash': claims['sh'], 'token_version': 2}
+
+
+def encode_bitmap(bits, length):
+    """Unpadded base64url of a little-endian bitmap"""
+    return base64.urlsafe_b64encode(bits.to_bytes((length + 7) // 8, 'little')).rstrip(b'=').decode()
+
+
+def decode_bitmap(text):
+    return int.from_bytes(base64.urlsafe_b64decode(text + '=' * (-len(text) % 4)), 'little')
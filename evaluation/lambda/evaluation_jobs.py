@@ -0,0 +1,227 @@
+"""
+Asynchronous Evaluation Jobs
+A single-student request with "async": true (or every request, with EVAL_MODE=async) is enqueued
+and answered at once with 202 and a job ID; workers drain the queue and record each job's outcome
+in jobs/{job_id}.json, which clients poll (or long-poll with "wait") with the job ID
+
+Queues (EVAL_JOB_QUEUE):
+- 'sqs': messages on EVAL_JOB_QUEUE_URL; the evaluator Lambda consumes them through its SQS event
+  source, so the event source's maximum concurrency is the worker pool
+- 'local': in-process worker threads, for long-running processes and offline runs
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from evaluator_dynamic import (
+    BATCH_CONCURRENCY,
+    BUCKET_NAME,
+    EvaluationError,
+    error_response,
+    evaluate_student,
+    evaluation_response_body,
+    finish_evaluation,
+    get_s3_client,
+    run_concurrently,
+)
+
+JOB_PREFIX = 'jobs'
+JOB_QUEUE_URL = os.environ.get('EVAL_JOB_QUEUE_URL')
+JOB_QUEUE_TYPE = os.environ.get('EVAL_JOB_QUEUE', 'sqs' if JOB_QUEUE_URL else '')
+JOB_WORKERS = int(os.environ.get('EVAL_JOB_WORKERS', '4'))
+REQUEST_KEYS = ('student_id', 'task_id', 'cluster_endpoint', 'cluster_token')
+FINISHED_STATUSES = ('completed', 'error')
+
+# Long polls hold the request until the job finishes or this many seconds pass, re-reading the record
+# every interval, or as soon as a worker in this process stores an update
+JOB_POLL_MAX_WAIT = 20
+JOB_POLL_INTERVAL = 1.0
+JOB_UPDATED = threading.Condition()
+
+# The queue in use, created on first use by get_job_queue() (None: async jobs unavailable)
+job_queue = None
+JOB_QUEUE_LOCK = threading.Lock()
+
+
+class SqsJobQueue:
+    """Jobs as SQS messages, consumed by the evaluator Lambda's SQS event source"""
+
+    def __init__(self, queue_url):
+        import boto3
+
+        self.queue_url = queue_url
+        self.sqs = boto3.client('sqs')
+
+    def put(self, message):
+        self.sqs.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps(message))
+
+
+class LocalJobQueue:
+    """In-process queue drained by daemon worker threads"""
+
+    def __init__(self, workers=JOB_WORKERS):
+        self.queue = queue.Queue()
+        for _ in range(workers):
+            threading.Thread(target=self.work, daemon=True).start()
+
+    def put(self, message):
+        self.queue.put(message)
+
+    def work(self):
+        while True:
+            message = self.queue.get()
+            try:
+                run_job(message)
+            except Exception as e:
+                print(f"Job {message.get('job_id')} failed: {e}")
+            finally:
+                self.queue.task_done()
+
+    def join(self):
+        """Block until every queued job has run"""
+        self.queue.join()
+
+
+def get_job_queue():
+    """The configured job queue, created on first use; None when none is configured"""
+    global job_queue
+    if job_queue is None and JOB_QUEUE_TYPE:
+        with JOB_QUEUE_LOCK:
+            if job_queue is None:
+                if JOB_QUEUE_TYPE == 'local':
+                    job_queue = LocalJobQueue()
+                elif JOB_QUEUE_TYPE == 'sqs' and JOB_QUEUE_URL:
+                    job_queue = SqsJobQueue(JOB_QUEUE_URL)
+                else:
+                    raise ValueError(f'Unsupported job queue {JOB_QUEUE_TYPE!r} (sqs needs EVAL_JOB_QUEUE_URL)')
+    return job_queue
+
+
+def submit_job(body):
+    """Enqueue an evaluation and answer 202 with its job ID; None if no job queue is configured"""
+    jobs = get_job_queue()
+    if jobs is None:
+        return None
+
+    job_id = str(uuid.uuid4())
+    record = {'job_id': job_id, 'student_id': body['student_id'], 'task_id': body['task_id'],
+              'status': 'queued', 'submitted_at': datetime.utcnow().isoformat()}
+    store_job_record(record)
+    try:
+        # The cluster token travels only in the queue message, never in the job record
+        jobs.put({'job_id': job_id, 'request': {key: body[key] for key in REQUEST_KEYS}})
+    except Exception as e:
+        store_job_record(dict(record, status='error', statusCode=500,
+                              result={'error': 'Could not queue evaluation', 'details': str(e)}))
+        raise
+
+    print(f"Job {job_id} queued: student={body['student_id']}, task={body['task_id']}")
+    return {'statusCode': 202, 'body': json.dumps(job_status_body(record))}
+
+
+def run_job(message):
+    """Run one queued evaluation and record its outcome; returns the final job record"""
+    job_id = message['job_id']
+    request = message['request']
+    record = load_job_record(job_id) or {'job_id': job_id, 'student_id': request['student_id'],
+                                         'task_id': request['task_id']}
+    if record.get('status') in FINISHED_STATUSES:
+        # Queues deliver at least once: a redelivered job keeps its first outcome
+        print(f"Job {job_id} already {record['status']}, skipping")
+        return record
+
+    record.update(status='running', started_at=datetime.utcnow().isoformat())
+    store_job_record(record)
+
+    try:
+        report, summary = evaluate_student(request['student_id'], request['task_id'],
+                                           request['cluster_endpoint'], request['cluster_token'])
+        finish_evaluation(report)
+        record.update(status='completed', statusCode=200, result=evaluation_response_body(report, summary))
+    except EvaluationError as e:
+        record.update(status='error', statusCode=e.status_code, result={'error': e.error, 'details': e.details})
+    except Exception as e:
+        print(f"Evaluation error in job {job_id}: {e}")
+        record.update(status='error', statusCode=500, result={'error': 'Internal error', 'details': str(e)})
+
+    record['finished_at'] = datetime.utcnow().isoformat()
+    store_job_record(record)
+    print(f"Job {job_id} {record['status']} (HTTP {record['statusCode']})")
+    return record
+
+
+def poll_job(job_id, wait=0):
+    """A job's result once finished (its own status code), else 202 with its status after up to wait seconds"""
+    try:
+        job_id = str(uuid.UUID(str(job_id)))
+    except ValueError:
+        return error_response(400, 'Invalid job ID', 'job_id must be the ID returned when the job was queued')
+    try:
+        wait = min(max(float(wait or 0), 0), JOB_POLL_MAX_WAIT)
+    except (TypeError, ValueError):
+        return error_response(400, 'Invalid wait', 'wait must be a number of seconds')
+
+    deadline = time.monotonic() + wait
+    while True:
+        record = load_job_record(job_id)
+        if record is None:
+            return error_response(404, 'Job not found', job_id)
+        if record['status'] in FINISHED_STATUSES:
+            return {'statusCode': record['statusCode'], 'body': json.dumps(dict(record['result'], job_id=job_id))}
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return {'statusCode': 202, 'body': json.dumps(job_status_body(record))}
+        with JOB_UPDATED:
+            JOB_UPDATED.wait(min(JOB_POLL_INTERVAL, remaining))
+
+
+def job_status_body(record):
+    """Response body for a job that has not finished yet"""
+    return {key: record[key] for key in ('job_id', 'status', 'submitted_at', 'started_at') if key in record}
+
+
+def is_job_event(event):
+    """Whether the invocation is a batch of job messages from the SQS event source"""
+    records = event.get('Records')
+    return bool(records) and records[0].get('eventSource') == 'aws:sqs'
+
+
+def handle_job_event(event):
+    """Run the jobs in an SQS batch, reporting only messages that could not be processed for redelivery"""
+
+    def run_record(record):
+        try:
+            run_job(json.loads(record['body']))
+            return None
+        except Exception as e:
+            print(f"Job message {record['messageId']} failed: {e}")
+            return {'itemIdentifier': record['messageId']}
+
+    failures = run_concurrently([(run_record, record) for record in event['Records']], BATCH_CONCURRENCY)
+    return {'batchItemFailures': [failure for failure in failures if failure]}
+
+
+def load_job_record(job_id):
+    """Load a job record, None if there is none"""
+    s3 = get_s3_client()
+    try:
+        response = s3.get_object(Bucket=BUCKET_NAME, Key=f'{JOB_PREFIX}/{job_id}.json')
+        return json.loads(response['Body'].read())
+    except s3.exceptions.NoSuchKey:
+        return None
+
+
+def store_job_record(record):
+    get_s3_client().put_object(
+        Bucket=BUCKET_NAME,
+        Key=f"{JOB_PREFIX}/{record['job_id']}.json",
+        Body=json.dumps(record),
+        ContentType='application/json'
+    )
+    with JOB_UPDATED:
+        JOB_UPDATED.notify_all()
@@ -0,0 +1,117 @@
+"""
+Evaluation Metrics
+CloudWatch Embedded Metric Format (EMF) records derived from each finished evaluation's trace (and
+written by the submitter per submission) to stdout as JSON lines. In Lambda, CloudWatch Logs extracts
+them as metrics with task_id and phase dimensions; elsewhere instructor-tools/metrics-report.py turns
+a log file into histograms. The submitter packages this module
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+METRICS_ENABLED = os.environ.get('EMF_METRICS', 'true').lower() == 'true'
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'K8sAssessment')
+
+# Every record has both dimensions; the second set aggregates a phase over all tasks
+DIMENSION_SETS = [['task_id', 'phase'], ['phase']]
+
+# Spans reported as phase durations, by kind (the span name is the phase)
+PHASE_KINDS = ('phase', 'test_runner', 'logs', 'scoring')
+
+METRIC_UNITS = {
+    'Evaluations': 'Count',
+    'EvaluationErrors': 'Count',
+    'EvaluationDuration': 'Milliseconds',
+    'KubeApiCalls': 'Count',
+    'KubeApiErrors': 'Count',
+    'PhaseDuration': 'Milliseconds',
+    'TestRunnerStartup': 'Milliseconds',
+    'S3WriteLatency': 'Milliseconds',
+    'IndexUpdatesAbandoned': 'Count',
+    'Submissions': 'Count',
+    'SubmissionRejections': 'Count',
+    'SubmissionErrors': 'Count',
+    'SubmissionDuration': 'Milliseconds',
+}
+
+# EMF accepts at most 100 values per metric in one record
+EMF_MAX_VALUES = 100
+
+# Keeps records from concurrent evaluations on separate lines
+EMIT_LOCK = threading.Lock()
+
+
+def metric_record(task_id, phase, metrics, timestamp_ms=None, **properties):
+    """One EMF record; metrics maps names in METRIC_UNITS to a value or a list of values"""
+    return {
+        '_aws': {
+            'Timestamp': timestamp_ms or int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': DIMENSION_SETS,
+                'Metrics': [{'Name': name, 'Unit': METRIC_UNITS[name]} for name in metrics],
+            }],
+        },
+        'task_id': task_id,
+        'phase': phase,
+        **properties,
+        **{name: value[:EMF_MAX_VALUES] if isinstance(value, list) else value for name, value in metrics.items()},
+    }
+
+
+def evaluation_records(trace, task_id, status):
+    """EMF records for a finished evaluation's trace (as stored): one per evaluation, one per phase"""
+    spans = trace['spans']
+    timestamp_ms = trace['start_ns'] // 1_000_000
+    kube_calls = [span for span in spans if span['kind'] == 'kube_api']
+    metrics = {
+        'Evaluations': 1,
+        'EvaluationErrors': int(status == 'error'),
+        'KubeApiCalls': len(kube_calls),
+        'KubeApiErrors': sum(1 for span in kube_calls
+                             if span['status'] == 'error' or span.get('status_code', 0) >= 400),
+    }
+    root = next((span for span in spans if span['kind'] == 'evaluation'), None)
+    if root:
+        metrics['EvaluationDuration'] = root['duration_ms']
+    records = [metric_record(task_id, 'evaluation', metrics, timestamp_ms, status=status,
+                             trace_id=trace['trace_id'])]
+
+    phases = {}
+    for span in spans:
+        if span['kind'] in PHASE_KINDS:
+            phases.setdefault(span['name'], {}).setdefault('PhaseDuration', []).append(span['duration_ms'])
+        elif span['kind'] == 's3' and span['name'].startswith('s3 PUT'):
+            phases.setdefault(span['name'], {}).setdefault('S3WriteLatency', []).append(span['duration_ms'])
+        if 'startup_ms' in span:
+            phases.setdefault(span['name'], {}).setdefault('TestRunnerStartup', []).append(span['startup_ms'])
+    records += [metric_record(task_id, phase, phase_metrics, timestamp_ms)
+                for phase, phase_metrics in phases.items()]
+    return records
+
+
+def emit_evaluation_metrics(trace, task_id, status):
+    """Write a finished evaluation's metric records to stdout; never raises"""
+    try:
+        records = evaluation_records(trace.to_dict(), task_id, status) if METRICS_ENABLED else []
+    except Exception as e:
+        print(f"Metric emission failed: {e}")
+        return
+    emit_records(records)
+
+
+def emit_records(records):
+    """Write metric records to stdout as JSON lines; never raises"""
+    if not METRICS_ENABLED or not records:
+        return
+    try:
+        lines = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+    except Exception as e:
+        print(f"Metric emission failed: {e}")
+        return
+    with EMIT_LOCK:
+        sys.stdout.write(lines)
+        sys.stdout.flush()
@@ -0,0 +1,128 @@
+"""
+Result Index
+index/tasks/{task_id}.json (leaderboard) and index/students/{student_id}.json (latest per task),
+derived from stored evaluations and submissions. Shared by the evaluator and the submitter, which
+both package this module
+"""
+
+import contextvars
+import json
+import os
+import random
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+from metrics import emit_records, metric_record
+
+INDEX_PREFIX = 'index'
+
+# Index objects are updated with conditional PUTs. A write that loses the race is retried, with
+# capped backoff, until the invocation's deadline (less a margin to return the response), or for
+# INDEX_UPDATE_SECONDS when there is none; an update abandoned at the deadline is logged and counted
+# as IndexUpdatesAbandoned, and the entry reappears with the student's next evaluation or submission
+INDEX_UPDATE_SECONDS = float(os.environ.get('INDEX_UPDATE_SECONDS', '30'))
+INDEX_DEADLINE_MARGIN = 2
+INDEX_RETRY_MAX_DELAY = 1.0
+INDEX_DEADLINE = contextvars.ContextVar('index_deadline', default=None)
+
+
+def set_index_deadline(context):
+    """Let index updates in this invocation retry until shortly before the Lambda times out"""
+    INDEX_DEADLINE.set(time.monotonic() + context.get_remaining_time_in_millis() / 1000 - INDEX_DEADLINE_MARGIN
+                       if context else None)
+
+
+def index_updates(entries):
+    """(key, merge) for each index object the (student_id, task_id, kind, record) entries touch"""
+    by_task, by_student = {}, {}
+    for student_id, task_id, kind, record in entries:
+        by_task.setdefault(task_id, []).append((student_id, kind, record))
+        by_student.setdefault(student_id, []).append((task_id, kind, record))
+
+    updates = [(f'{INDEX_PREFIX}/tasks/{task_id}.json',
+                lambda index, task_id=task_id, items=items: merge_task_index(index, task_id, items))
+               for task_id, items in by_task.items()]
+    updates += [(f'{INDEX_PREFIX}/students/{student_id}.json',
+                 lambda index, student_id=student_id, items=items: merge_student_index(index, student_id, items))
+                for student_id, items in by_student.items()]
+    return updates
+
+
+def merge_index_record(entry, kind, record):
+    """Store a record as the latest of its kind, keeping the best evaluation score"""
+    if record['timestamp'] >= entry.get(kind, {}).get('timestamp', ''):
+        entry[kind] = record
+    if kind == 'evaluation':
+        entry['best_score'] = max(entry.get('best_score', 0), record['score'])
+
+
+def merge_task_index(index, task_id, items):
+    """Apply (student_id, kind, record) items to a task's leaderboard manifest"""
+    students = index.setdefault('students', {})
+    for student_id, kind, record in items:
+        merge_index_record(students.setdefault(student_id, {}), kind, record)
+
+    # A submitted score stands in for the student's latest evaluation
+    board = []
+    for student_id, entry in students.items():
+        latest = entry.get('submission') or entry.get('evaluation')
+        board.append({'student_id': student_id, 'score': latest['score'], 'max_score': latest['max_score'],
+                      'submitted': 'submission' in entry})
+    board.sort(key=lambda row: (-row['score'], row['student_id']))
+
+    index.update(task_id=task_id, updated_at=datetime.utcnow().isoformat(), leaderboard=board)
+
+
+def merge_student_index(index, student_id, items):
+    """Apply (task_id, kind, record) items to a student's latest-per-task index"""
+    tasks = index.setdefault('tasks', {})
+    for task_id, kind, record in items:
+        merge_index_record(tasks.setdefault(task_id, {}), kind, record)
+    index.update(student_id=student_id, updated_at=datetime.utcnow().isoformat())
+
+
+def update_index_object(s3, bucket, key, merge, timed=None):
+    """Read-modify-write an index object with a conditional PUT, retrying while other writers get in first
+
+    timed(name, **attributes) wraps each S3 call (a trace span or a latency timer)
+    """
+    from botocore.exceptions import ParamValidationError
+
+    timed = timed or (lambda name, **attributes: nullcontext())
+    deadline = INDEX_DEADLINE.get() or time.monotonic() + INDEX_UPDATE_SECONDS
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            with timed('s3 GET index', key=key):
+                response = s3.get_object(Bucket=bucket, Key=key)
+                index = json.loads(response['Body'].read())
+            condition = {'IfMatch': response['ETag']}
+        except s3.exceptions.NoSuchKey:
+            index, condition = {}, {'IfNoneMatch': '*'}
+
+        merge(index)
+        body = json.dumps(index, separators=(',', ':'))
+        try:
+            with timed('s3 PUT index', key=key, request_bytes=len(body), attempt=attempt):
+                s3.put_object(Bucket=bucket, Key=key, Body=body, ContentType='application/json', **condition)
+            return True
+        except ParamValidationError:
+            # SDKs predating S3 conditional writes: last writer wins
+            with timed('s3 PUT index', key=key, request_bytes=len(body), attempt=attempt):
+                s3.put_object(Bucket=bucket, Key=key, Body=body, ContentType='application/json')
+            return True
+        except s3.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(random.uniform(0, min(0.05 * 2 ** min(attempt, 10), INDEX_RETRY_MAX_DELAY)), remaining))
+
+    print(f"Abandoned updating {key} after {attempt} conflicting writes")
+    emit_records([metric_record(index.get('task_id', 'unknown'), 'index', {'IndexUpdatesAbandoned': 1},
+                                key=key, attempts=attempt)])
+    return False
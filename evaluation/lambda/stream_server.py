@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Streaming Evaluation Server
+Serves POST /evaluate as chunked NDJSON: one line per phase and check result as it completes,
+then a final 'result' line carrying the same body lambda_handler returns. A batch request
+("targets") streams one 'target' line per student as each evaluation finishes and is stored
+
+Local and self-hosted use only: the deployed Lambda answers with plain JSON (Python Lambdas cannot
+stream responses natively, and no Lambda Web Adapter deployment is provided). Run it with
+python3 stream_server.py and point kubeafr's EVAL_STREAM_ENDPOINT at it
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from evaluator_dynamic import (
+    EvaluationError,
+    api_key_valid,
+    batch_request_error,
+    evaluate_batch,
+    evaluate_student,
+    evaluation_response_body,
+    finish_evaluation,
+    missing_parameters,
+)
+
+SERVER_PORT = int(os.environ.get('PORT', '8080'))
+NDJSON = 'application/x-ndjson'
+
+
+class EvaluationStreamHandler(BaseHTTPRequestHandler):
+    """POST /evaluate streams NDJSON progress; GET /healthz answers readiness checks"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/healthz':
+            self.send_json(200, {'status': 'ok'})
+        else:
+            self.send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path.rstrip('/') not in ('/evaluate', ''):
+            self.send_json(404, {'error': 'Not found'})
+            return
+
+        if not api_key_valid(self.headers):
+            self.send_json(401, {'error': 'Unauthorized', 'details': 'Invalid or missing API key'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length < 0:
+                raise ValueError(f"Invalid Content-Length: {length}")
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(body, dict):
+                raise ValueError("Expected a JSON object")
+        except ValueError as e:
+            # The body may be unread: the connection cannot carry another request
+            self.close_connection = True
+            self.send_json(400, {'error': 'Invalid request body', 'details': str(e)})
+            return
+
+        if 'targets' in body:
+            error = batch_request_error(body)
+            if error:
+                self.send_json(error['statusCode'], json.loads(error['body']))
+                return
+        else:
+            missing = missing_parameters(body)
+            if missing:
+                self.send_json(400, {'error': 'Missing required parameters', 'details': missing})
+                return
+
+        self.send_response(200)
+        self.send_header('Content-Type', NDJSON)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        # Progress events arrive from evaluator threads (test-runner and custom checks)
+        lock = threading.Lock()
+        started = time.monotonic()
+
+        def emit(event):
+            event = dict(event, elapsed_ms=int((time.monotonic() - started) * 1000))
+            line = json.dumps(event).encode() + b'\n'
+            with lock:
+                try:
+                    self.wfile.write(f'{len(line):x}\r\n'.encode() + line + b'\r\n')
+                    self.wfile.flush()
+                except OSError:
+                    # Client went away; finish the evaluation so the report is still stored
+                    pass
+
+        if 'targets' in body:
+            self.stream_batch(body, emit)
+        else:
+            self.stream_evaluation(body, emit)
+
+        with lock:
+            try:
+                self.wfile.write(b'0\r\n\r\n')
+                self.wfile.flush()
+            except OSError:
+                pass
+
+    def stream_evaluation(self, body, emit):
+        try:
+            report, summary = evaluate_student(body['student_id'], body['task_id'], body['cluster_endpoint'],
+                                               body['cluster_token'], on_progress=emit)
+            finish_evaluation(report)
+            emit({'type': 'result', 'statusCode': 200, **evaluation_response_body(report, summary)})
+        except EvaluationError as e:
+            emit({'type': 'error', 'statusCode': e.status_code, 'error': e.error, 'details': e.details})
+        except Exception as e:
+            print(f"Evaluation error: {e}")
+            emit({'type': 'error', 'statusCode': 500, 'error': 'Internal error', 'details': str(e)})
+
+    def stream_batch(self, body, emit):
+        try:
+            response = evaluate_batch(body, on_result=lambda entry: emit({'type': 'target', **entry}))
+            emit({'type': 'result', 'statusCode': response['statusCode'], **json.loads(response['body'])})
+        except Exception as e:
+            print(f"Batch error: {e}")
+            emit({'type': 'error', 'statusCode': 500, 'error': 'Internal error', 'details': str(e)})
+
+    def log_message(self, format, *args):
+        if self.path != '/healthz':
+            super().log_message(format, *args)
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def serve():
+    """Serve streaming evaluations until interrupted"""
+    server = ThreadingHTTPServer(('0.0.0.0', SERVER_PORT), EvaluationStreamHandler)
+    server.daemon_threads = True
+    print(f"Streaming evaluator serving on port {SERVER_PORT}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    serve()
@@ -0,0 +1,215 @@
+"""
+Evaluation Tracing
+Spans for one evaluation: every kube API request, test-runner phase, log fetch, S3 call and
+scoring step, with its duration and, for HTTP requests, status code and bytes. The trace is
+stored under traces/ (the evaluation report keeps its trace_id) and, with OTEL_EXPORTER_OTLP_ENDPOINT
+set, exported as OTLP/JSON to any OpenTelemetry collector
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# The trace new spans attach to and the innermost open span; run_concurrently carries both into
+# its worker threads (and asyncio tasks inherit them)
+CURRENT_TRACE = contextvars.ContextVar('current_trace', default=None)
+CURRENT_SPAN = contextvars.ContextVar('current_span', default=None)
+
+# Spans kept per trace; any beyond are only counted
+TRACE_MAX_SPANS = int(os.environ.get('TRACE_MAX_SPANS', '500'))
+
+# OTLP/HTTP export with the standard OpenTelemetry exporter variables
+OTLP_ENDPOINT = os.environ.get('OTEL_EXPORTER_OTLP_TRACES_ENDPOINT') or (
+    os.environ['OTEL_EXPORTER_OTLP_ENDPOINT'].rstrip('/') + '/v1/traces'
+    if os.environ.get('OTEL_EXPORTER_OTLP_ENDPOINT') else None)
+OTLP_HEADERS = dict(header.split('=', 1) for header in os.environ.get('OTEL_EXPORTER_OTLP_HEADERS', '').split(',')
+                    if '=' in header)
+OTLP_SERVICE_NAME = os.environ.get('OTEL_SERVICE_NAME', 'k8s-evaluator')
+OTLP_EXPORT_TIMEOUT = 2
+
+# Fields every stored span has; anything else is an attribute
+SPAN_FIELDS = ('span_id', 'parent_id', 'name', 'kind', 'start_ms', 'duration_ms', 'status')
+
+# Attribute names in stored spans -> OpenTelemetry semantic convention names
+OTLP_ATTRIBUTE_NAMES = {
+    'method': 'http.request.method',
+    'path': 'url.path',
+    'status_code': 'http.response.status_code',
+    'bytes': 'http.response.body.size',
+    'request_bytes': 'http.request.body.size',
+    'error': 'error.type',
+}
+
+# Path segments following these are object names, not part of a kube API route
+KUBE_COLLECTIONS = frozenset({'namespaces', 'pods', 'deployments', 'statefulsets', 'services', 'configmaps',
+                              'secrets', 'persistentvolumeclaims', 'nodes', 'replicasets', 'events'})
+
+
+class Trace:
+    """Spans recorded during one evaluation; span times are milliseconds from the trace start"""
+
+    def __init__(self, trace_id=None, start_ns=None, spans=(), dropped=0):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.start_ns = start_ns or time.time_ns()
+        self.spans = list(spans)
+        self.dropped = dropped
+        self.lock = threading.Lock()
+        # Spans opened outside any other span attach to the first top-level one
+        self.root_id = next((span['span_id'] for span in self.spans if not span['parent_id']), None)
+
+    @classmethod
+    def resume(cls, data):
+        """Continue a trace (e.g. with the writes made after its report was built)"""
+        if not data:
+            return cls()
+        return cls(data['trace_id'], data['start_ns'], data['spans'], data.get('dropped_spans', 0))
+
+    @contextmanager
+    def activate(self):
+        """Make this the trace that span() records into, in the current context"""
+        trace_token = CURRENT_TRACE.set(self)
+        span_token = CURRENT_SPAN.set(self.root_id)
+        try:
+            yield self
+        finally:
+            CURRENT_SPAN.reset(span_token)
+            CURRENT_TRACE.reset(trace_token)
+
+    def add(self, span):
+        with self.lock:
+            if len(self.spans) < TRACE_MAX_SPANS:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+    def to_dict(self):
+        """The trace as stored under traces/, spans in start order"""
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: span['start_ms'])
+            dropped = self.dropped
+        data = {'trace_id': self.trace_id, 'start_ns': self.start_ns, 'spans': spans}
+        if dropped:
+            data['dropped_spans'] = dropped
+        return data
+
+    def summary(self):
+        """One log line: span count, API calls and the slowest spans"""
+        spans = self.to_dict()['spans']
+        api_calls = sum(1 for span in spans if span['kind'] == 'kube_api')
+        slowest = sorted((span for span in spans if span['parent_id']), key=lambda span: -span['duration_ms'])[:3]
+        return (f"Trace {self.trace_id}: {len(spans)} spans, {api_calls} kube API calls; slowest: "
+                + ', '.join(f"{span['name']} {span['duration_ms']:.0f}ms" for span in slowest))
+
+    def to_otlp(self, service_name=OTLP_SERVICE_NAME):
+        """The trace as an OTLP/JSON ExportTraceServiceRequest"""
+        return {'resourceSpans': [{
+            'resource': {'attributes': [otlp_attribute('service.name', service_name)]},
+            'scopeSpans': [{'scope': {'name': 'k8s-assessment'},
+                            'spans': [otlp_span(self, span) for span in self.to_dict()['spans']]}]
+        }]}
+
+
+@contextmanager
+def span(name, kind='internal', **attributes):
+    """Time a block as a span of the current trace (a no-op without one); yields its attributes to fill in"""
+    trace = CURRENT_TRACE.get()
+    if trace is None:
+        yield attributes
+        return
+
+    span_id = uuid.uuid4().hex[:16]
+    parent_id = CURRENT_SPAN.get()
+    token = CURRENT_SPAN.set(span_id)
+    start_ns, started = time.time_ns(), time.perf_counter()
+    status = 'ok'
+    try:
+        yield attributes
+    except BaseException as e:
+        status = 'error'
+        attributes.setdefault('error', type(e).__name__)
+        raise
+    finally:
+        CURRENT_SPAN.reset(token)
+        trace.add({'span_id': span_id, 'parent_id': parent_id, 'name': name, 'kind': kind,
+                   'start_ms': round((start_ns - trace.start_ns) / 1e6, 2),
+                   'duration_ms': round((time.perf_counter() - started) * 1000, 2), 'status': status, **attributes})
+
+
+def trace_session(session):
+    """Record a kube_api span for every request made through a requests session while a trace is active"""
+    request = session.request
+
+    def traced_request(method, url, *args, **kwargs):
+        path = urlsplit(url).path
+        with span(f'{method} {kube_route(path)}', 'kube_api', method=method, path=path) as attributes:
+            resp = request(method, url, *args, **kwargs)
+            attributes['status_code'] = resp.status_code
+            attributes['request_bytes'] = len(resp.request.body or b'')
+            # Streamed responses (log follows, watches) are timed to their headers: the caller reads the body
+            attributes['bytes'] = (int(resp.headers.get('Content-Length') or 0) if kwargs.get('stream')
+                                   else len(resp.content))
+            return resp
+
+    session.request = traced_request
+    return session
+
+
+def kube_route(path):
+    """A kube API path with namespace and object names replaced, so spans group across students and pods"""
+    segments = path.strip('/').split('/')
+    for i in range(1, len(segments)):
+        if segments[i - 1] in KUBE_COLLECTIONS and segments[i] not in KUBE_COLLECTIONS:
+            segments[i] = '{namespace}' if segments[i - 1] == 'namespaces' else '{name}'
+    return '/' + '/'.join(segments)
+
+
+def otlp_span(trace, span):
+    start = trace.start_ns + int(span['start_ms'] * 1e6)
+    otlp = {
+        'traceId': trace.trace_id,
+        'spanId': span['span_id'],
+        'name': span['name'],
+        'kind': 3 if span['kind'] in ('kube_api', 's3') else 1,  # SPAN_KIND_CLIENT / SPAN_KIND_INTERNAL
+        'startTimeUnixNano': str(start),
+        'endTimeUnixNano': str(start + int(span['duration_ms'] * 1e6)),
+        'attributes': [otlp_attribute('evaluation.span.kind', span['kind'])] + [
+            otlp_attribute(OTLP_ATTRIBUTE_NAMES.get(key, key), value)
+            for key, value in span.items() if key not in SPAN_FIELDS and value is not None],
+        'status': {'code': 2 if span['status'] == 'error' else 1},  # STATUS_CODE_ERROR / STATUS_CODE_OK
+    }
+    if span['parent_id']:
+        otlp['parentSpanId'] = span['parent_id']
+    return otlp
+
+
+def otlp_attribute(key, value):
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+def export_trace(trace):
+    """POST a trace to the configured OTLP/HTTP endpoint; never raises (tracing must not fail an evaluation)"""
+    if not OTLP_ENDPOINT:
+        return False
+
+    import urllib.request
+
+    request = urllib.request.Request(OTLP_ENDPOINT, data=json.dumps(trace.to_otlp()).encode(),
+                                     headers={'Content-Type': 'application/json', **OTLP_HEADERS})
+    try:
+        with urllib.request.urlopen(request, timeout=OTLP_EXPORT_TIMEOUT) as resp:
+            resp.read()
+        return True
+    except Exception as e:
+        print(f"Trace export to {OTLP_ENDPOINT} failed: {e}")
+        return False
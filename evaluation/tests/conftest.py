@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the evaluator tests: the evaluator with S3 replaced by the benchmarks'
+in-memory bucket, and a Lambda context with a fixed remaining time
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / 'evaluation' / 'lambda'))
+sys.path.insert(0, str(ROOT / 'evaluation' / 'bench'))
+
+os.environ.setdefault('JWT_SECRET', 'test-secret-' + 'x' * 32)
+os.environ.pop('API_KEY', None)
+
+import evaluator_dynamic  # noqa: E402
+from bench_e2e import MemoryS3  # noqa: E402
+
+
+class LambdaContext:
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+@pytest.fixture
+def evaluator(monkeypatch):
+    """evaluator_dynamic writing to an in-memory bucket"""
+    monkeypatch.setattr(evaluator_dynamic, 's3', MemoryS3())
+    return evaluator_dynamic
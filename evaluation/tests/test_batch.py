@@ -0,0 +1,47 @@
+import json
+import time
+
+import pytest
+
+import result_index
+from conftest import LambdaContext
+
+
+def batch_event(targets, **fields):
+    return {'body': json.dumps({'targets': targets, **fields})}
+
+
+def target(student_id):
+    return {'student_id': student_id, 'task_id': 'task-01', 'cluster_endpoint': 'https://127.0.0.1:6443',
+            'cluster_token': 'token'}
+
+
+@pytest.mark.parametrize('value', ['abc', None, 0, -1, 1.5, True, [2]])
+def test_invalid_max_concurrency_is_a_bad_request(evaluator, value):
+    response = evaluator.lambda_handler(batch_event([target('S1')], max_concurrency=value), LambdaContext(300000))
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body'])['details'] == 'max_concurrency must be a positive integer'
+
+
+def test_max_concurrency_is_capped(evaluator):
+    assert evaluator.batch_concurrency({'max_concurrency': '3'}) == 3
+    assert evaluator.batch_concurrency({'max_concurrency': 10 ** 6}) == evaluator.BATCH_CONCURRENCY
+
+
+def test_batch_workers_keep_the_invocation_index_deadline(evaluator, monkeypatch):
+    seen = []
+
+    def evaluate_student(student_id, *args, **kwargs):
+        seen.append(result_index.INDEX_DEADLINE.get())
+        raise evaluator.EvaluationError(404, 'Task not found', student_id)
+
+    monkeypatch.setattr(evaluator, 'evaluate_student', evaluate_student)
+    started = time.monotonic()
+    response = evaluator.lambda_handler(batch_event([target('S1'), target('S2'), target('S3')], max_concurrency=3),
+                                        LambdaContext(120000))
+
+    assert response['statusCode'] == 200
+    expected = started + 120 - result_index.INDEX_DEADLINE_MARGIN
+    assert len(seen) == 3
+    assert all(deadline is not None and abs(deadline - expected) < 1 for deadline in seen)
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+import yaml
+
+from conftest import ROOT
+import fake_apiserver
+
+TASK_ID = 'task-03'
+
+
+@pytest.fixture
+def cluster():
+    """A fake apiserver whose namespace passes task-03, persistent test-runner included"""
+    spec = yaml.safe_load((ROOT / 'tasks' / TASK_ID / 'task-spec.yaml').read_text())
+    fixtures = fake_apiserver.fixtures_from_spec(spec)
+    fixtures['services'].append(fake_apiserver.test_runner_service(spec['namespace']))
+    with fake_apiserver.FakeApiServer(spec['namespace'], fixtures) as server:
+        yield server
+
+
+@pytest.fixture
+def shutdown_checks(evaluator, monkeypatch):
+    """Count graceful shutdown checks that actually run"""
+    runs = []
+    check = evaluator.TaskEvaluator.check_graceful_shutdown
+
+    def counted(self, *args, **kwargs):
+        runs.append(1)
+        return check(self, *args, **kwargs)
+
+    monkeypatch.setattr(evaluator.TaskEvaluator, 'check_graceful_shutdown', counted)
+    monkeypatch.setattr(evaluator, 'GRACEFUL_SHUTDOWN_TIMEOUT', 2)
+    return runs
+
+
+def evaluate(evaluator, cluster):
+    response = evaluator.lambda_handler({'body': json.dumps({
+        'student_id': 'INC01', 'task_id': TASK_ID, 'cluster_endpoint': cluster.url, 'cluster_token': 'token'
+    })}, None)
+    assert response['statusCode'] == 200
+    return json.loads(response['body'])
+
+
+def bump(obj):
+    obj['metadata']['resourceVersion'] = str(int(obj['metadata']['resourceVersion']) + 1000)
+
+
+def test_unchanged_namespace_reuses_the_evaluation(evaluator, cluster, shutdown_checks):
+    assert not evaluate(evaluator, cluster)['cached']
+    assert evaluate(evaluator, cluster)['cached']
+    assert len(shutdown_checks) == 1
+
+
+def test_service_change_reruns_graceful_shutdown(evaluator, cluster, shutdown_checks):
+    evaluate(evaluator, cluster)
+    bump(next(svc for svc in cluster.fixtures['services'] if svc['metadata']['name'] == 'svc-backend'))
+
+    assert not evaluate(evaluator, cluster)['cached']
+    assert len(shutdown_checks) == 2
+
+
+def test_configmap_change_reruns_graceful_shutdown(evaluator, cluster, shutdown_checks):
+    # task-03 requires no ConfigMaps, but the pods may still read one
+    cluster.fixtures['configmaps'].append({'metadata': {'name': 'frontend-config', 'resourceVersion': '1'}})
+    evaluate(evaluator, cluster)
+    bump(cluster.fixtures['configmaps'][0])
+
+    assert not evaluate(evaluator, cluster)['cached']
+    assert len(shutdown_checks) == 2
@@ -10,6 +10,39 @@ import jwt
 import os
 from datetime import datetime
 
+FRAMEWORK_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_BUCKET = os.environ.get('RESULTS_BUCKET', 'k8s-eval-results')
+
+# Token encoding shared with the evaluator and submitter
+sys.path.insert(0, os.path.join(FRAMEWORK_ROOT, 'evaluation', 'lambda'))
+from eval_token import expand_token_claims, token_schema_key
+
+
+def token_result_keys(claims):
+    """Result keys a compact (version 2) token was encoded against: local task spec if unchanged, else S3"""
+    from evaluator_dynamic import compile_task_spec
+    import yaml
+
+    spec_path = os.path.join(FRAMEWORK_ROOT, 'tasks', claims['tid'], 'task-spec.yaml')
+    if os.path.exists(spec_path):
+        with open(spec_path) as f:
+            plan = compile_task_spec(yaml.safe_load(f))
+        if plan.spec_hash == claims['sh']:
+            return plan.result_keys
+
+    import boto3
+    response = boto3.client('s3').get_object(Bucket=RESULTS_BUCKET, Key=token_schema_key(claims['tid'], claims['sh']))
+    return json.loads(response['Body'].read())['result_keys']
+
+
+def expand_compact_token(claims):
+    """Expand version 2 claims for display; results are left out if their key order cannot be found"""
+    try:
+        return expand_token_claims(claims, token_result_keys(claims))
+    except Exception as e:
+        print(f"⚠️  Results not expanded, spec version {claims['sh']} unavailable: {e}")
+        return dict(expand_token_claims(claims, None), compact_results={'rp': claims['rp'], 'rv': claims['rv']})
+
 def decode_token(token, secret, verify=True):
     """
     Decode a JWT token and display its contents
@@ -29,6 +62,9 @@ def decode_token(token, secret, verify=True):
             payload = jwt.decode(token, options={"verify_signature": False}, algorithms=['HS256'])
             print("⚠️  Token decoded WITHOUT signature verification")
 
+        if payload.get('v') == 2:
+            payload = expand_compact_token(payload)
+
         print("\n" + "="*70)
         print("JWT TOKEN CONTENTS")
         print("="*70)
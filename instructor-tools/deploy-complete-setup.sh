@@ -158,8 +158,16 @@ if [ -f "requirements.txt" ]; then
     mkdir -p /tmp/lambda-package
     pip install -r requirements.txt -t /tmp/lambda-package --quiet --no-cache-dir 2>&1 | grep -v "already satisfied" || true
 
-    # Always use dynamic evaluator - MUST rename to evaluator.py for Lambda handler
-    cp evaluator_dynamic.py /tmp/lambda-package/evaluator.py
+    # Always use dynamic evaluator - Lambda handler is evaluator.lambda_handler,
+    # so evaluator.py re-exports it and the sibling modules keep their names
+    cp *.py /tmp/lambda-package/
+    echo "from evaluator_dynamic import lambda_handler  # noqa: F401" > /tmp/lambda-package/evaluator.py
+
+    # Ship bytecode for our modules (pip already compiled the dependencies): /var/task is
+    # read-only, so otherwise every cold start recompiles them. Only valid for the same Python
+    if python3 -c 'import sys; sys.exit(sys.version_info[:2] != (3, 11))'; then
+        python3 -m compileall -q --invalidation-mode checked-hash /tmp/lambda-package/*.py
+    fi
 
     cd /tmp/lambda-package
     zip -r /tmp/evaluator.zip . -q
@@ -175,6 +183,40 @@ fi
 
 cd ../../instructor-tools
 
+# Queue for asynchronous evaluation jobs (evaluation/lambda/evaluation_jobs.py). Its visibility
+# timeout outlasts the Lambda timeout, so a job is never redelivered while it is still running
+EVAL_JOB_QUEUE_NAME="k8s-evaluation-jobs"
+EVAL_JOB_CONCURRENCY=10
+echo "⏳ Creating evaluation job queue..."
+EVAL_JOB_QUEUE_URL=$(aws sqs create-queue \
+    --queue-name ${EVAL_JOB_QUEUE_NAME} \
+    --attributes VisibilityTimeout=360 \
+    --region ${REGION} \
+    --query 'QueueUrl' \
+    --output text)
+EVAL_JOB_QUEUE_ARN=$(aws sqs get-queue-attributes \
+    --queue-url ${EVAL_JOB_QUEUE_URL} \
+    --attribute-names QueueArn \
+    --region ${REGION} \
+    --query 'Attributes.QueueArn' \
+    --output text)
+EVAL_VARIABLES=(
+    "S3_BUCKET=${RESULTS_BUCKET}"
+    "API_KEY=${API_KEY}"
+    "TEST_RUNNER_IMAGE=test-runner:latest"
+    "EVAL_JOB_QUEUE_URL=${EVAL_JOB_QUEUE_URL}"
+)
+
+# --environment JSON for the variables in $1 (a JSON object, or null) updated with NAME=VALUE arguments
+lambda_environment() {
+    python3 - "$@" <<'EOFPY'
+import json, sys
+variables = json.loads(sys.argv[1]) or {}
+variables.update(arg.split('=', 1) for arg in sys.argv[2:])
+print(json.dumps({'Variables': variables}))
+EOFPY
+}
+
 # Create or update evaluation Lambda function
 EVAL_FUNCTION_NAME="k8s-evaluation-function"
 if aws lambda get-function --function-name ${EVAL_FUNCTION_NAME} --region ${REGION} 2>/dev/null >/dev/null; then
@@ -183,6 +225,18 @@ if aws lambda get-function --function-name ${EVAL_FUNCTION_NAME} --region ${REGI
         --function-name ${EVAL_FUNCTION_NAME} \
         --zip-file fileb:///tmp/evaluator.zip \
         --region ${REGION} >/dev/null
+    aws lambda wait function-updated --function-name ${EVAL_FUNCTION_NAME} --region ${REGION}
+    # --environment replaces every variable, so ours are merged into the function's current ones
+    # (settings added since, e.g. INCREMENTAL_EVAL or BATCH_CONCURRENCY, survive a redeploy)
+    CURRENT_VARIABLES=$(aws lambda get-function-configuration \
+        --function-name ${EVAL_FUNCTION_NAME} \
+        --region ${REGION} \
+        --query 'Environment.Variables' \
+        --output json)
+    aws lambda update-function-configuration \
+        --function-name ${EVAL_FUNCTION_NAME} \
+        --environment "$(lambda_environment "${CURRENT_VARIABLES}" "${EVAL_VARIABLES[@]}")" \
+        --region ${REGION} >/dev/null
 else
     echo "⏳ Creating evaluation Lambda..."
     aws lambda create-function \
@@ -193,7 +247,32 @@ else
         --zip-file fileb:///tmp/evaluator.zip \
         --timeout 300 \
         --memory-size 512 \
-        --environment "Variables={S3_BUCKET=${RESULTS_BUCKET},API_KEY=${API_KEY},TEST_RUNNER_IMAGE=test-runner:latest}" \
+        --environment "$(lambda_environment null "${EVAL_VARIABLES[@]}")" \
+        --region ${REGION} >/dev/null
+fi
+
+# The evaluator drains its own job queue: one job per invocation, at most EVAL_JOB_CONCURRENCY at once.
+# A redeploy updates the existing mapping; any other failure stops the script
+EVAL_JOB_MAPPING=$(aws lambda list-event-source-mappings \
+    --function-name ${EVAL_FUNCTION_NAME} \
+    --event-source-arn ${EVAL_JOB_QUEUE_ARN} \
+    --region ${REGION} \
+    --query 'EventSourceMappings[0].UUID' \
+    --output text)
+if [ -z "${EVAL_JOB_MAPPING}" ] || [ "${EVAL_JOB_MAPPING}" = "None" ]; then
+    aws lambda create-event-source-mapping \
+        --function-name ${EVAL_FUNCTION_NAME} \
+        --event-source-arn ${EVAL_JOB_QUEUE_ARN} \
+        --batch-size 1 \
+        --scaling-config MaximumConcurrency=${EVAL_JOB_CONCURRENCY} \
+        --function-response-types ReportBatchItemFailures \
+        --region ${REGION} >/dev/null
+else
+    aws lambda update-event-source-mapping \
+        --uuid ${EVAL_JOB_MAPPING} \
+        --batch-size 1 \
+        --scaling-config MaximumConcurrency=${EVAL_JOB_CONCURRENCY} \
+        --function-response-types ReportBatchItemFailures \
         --region ${REGION} >/dev/null
 fi
 
@@ -225,6 +304,9 @@ cd ../submission/lambda
 echo "⏳ Packaging submission Lambda..."
 rm -rf /tmp/submitter.zip 2>/dev/null || true
 zip -r /tmp/submitter.zip submitter.py -q
+# Modules shared with the evaluator, packaged at the zip root
+SUBMITTER_SHARED_MODULES="eval_token.py result_index.py metrics.py"
+(cd ../../evaluation/lambda && zip -q /tmp/submitter.zip ${SUBMITTER_SHARED_MODULES})
 echo "✅ Submission Lambda packaged"
 
 cd ../../instructor-tools
@@ -330,10 +412,12 @@ aws s3 cp ${TEMPLATE_FILE}.tmp "s3://${TEMPLATES_BUCKET}/${TEMPLATE_FILE}" --reg
 rm ${TEMPLATE_FILE}.tmp
 echo "✅ CloudFormation template configured"
 
-# Upload kubeafr CLI to S3
+# Upload kubeafr CLI to S3 (the entry script and its kubeafr_cli package, as one archive)
 echo "⏳ Uploading kubeafr CLI to S3..."
-if [ -f "../cli/kubeafr" ]; then
-    aws s3 cp ../cli/kubeafr "s3://${TEMPLATES_BUCKET}/tools/kubeafr" --region ${REGION} 2>/dev/null
+if [ -f "../cli/kubeafr" ] && [ -d "../cli/kubeafr_cli" ]; then
+    tar -czf /tmp/kubeafr.tar.gz --exclude __pycache__ -C ../cli kubeafr kubeafr_cli
+    aws s3 cp /tmp/kubeafr.tar.gz "s3://${TEMPLATES_BUCKET}/tools/kubeafr.tar.gz" --region ${REGION} 2>/dev/null
+    rm /tmp/kubeafr.tar.gz
     echo "✅ kubeafr CLI uploaded"
 else
     echo "⚠️  kubeafr CLI not found, skipping"
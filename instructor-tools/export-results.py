@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Columnar Results Export for Instructors
+Streams every evaluation and submission from the results bucket with parallel GETs,
+flattens per-criterion results into columns and writes Parquet (or Arrow) files partitioned by task
+
+Usage:
+    python3 export-results.py [--out results-export] [--workers 32] [--format parquet|arrow]
+    python3 export-results.py --stats [--out results-export]
+
+Layout (Hive-style, loads with pandas.read_parquet / pyarrow.dataset):
+    {out}/kind=evaluations/task_id=task-01/part-0.parquet
+    {out}/kind=submissions/task_id=task-01/part-0.parquet
+
+Requires: pip install boto3 pyarrow
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+RESULTS_BUCKET = os.environ.get('RESULTS_BUCKET', 'k8s-eval-results')
+KINDS = ('evaluations', 'submissions')
+RESULT_COLUMN_PREFIX = 'result_'
+
+# Scalar report fields exported as columns (eval_token and fingerprint are left out; trace_id
+# names the evaluation's trace under traces/)
+REPORT_FIELDS = ('student_id', 'task_id', 'timestamp', 'submission_timestamp',
+                 'score', 'max_score', 'status', 'trace_id')
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    print("❌ Error: pyarrow is required (pip install pyarrow)")
+    sys.exit(1)
+
+
+def list_result_keys(s3, kind):
+    """List every report key under evaluations/ or submissions/"""
+    keys = []
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=RESULTS_BUCKET, Prefix=f'{kind}/'):
+        for obj in page.get('Contents', []):
+            # {kind}/{student_id}/{task_id}/{timestamp}.json
+            if obj['Key'].endswith('.json') and obj['Key'].count('/') == 3:
+                keys.append(obj['Key'])
+    return keys
+
+
+def fetch_row(s3, kind, key):
+    """GET one report and flatten it into a row, None if unreadable"""
+    try:
+        report = json.loads(s3.get_object(Bucket=RESULTS_BUCKET, Key=key)['Body'].read())
+    except Exception as e:
+        print(f"⚠️  Skipping {key}: {e}")
+        return None
+
+    _, student_id, task_id, _ = key.split('/')
+    row = {'kind': kind, 'key': key}
+    row.update({field: report.get(field) for field in REPORT_FIELDS})
+    row['student_id'] = row['student_id'] or student_id
+    row['task_id'] = row['task_id'] or task_id
+    for criterion, value in (report.get('results') or {}).items():
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            row[RESULT_COLUMN_PREFIX + criterion] = value
+    return row
+
+
+def rows_to_table(rows):
+    """Build a table over the union of all rows' columns (criteria differ between tasks)"""
+    columns = {}
+    for row in rows:
+        for name in row:
+            columns.setdefault(name, None)
+    return pa.table({name: [row.get(name) for row in rows] for name in columns})
+
+
+def write_partition(table, path, fmt):
+    """Write one kind/task partition"""
+    os.makedirs(path, exist_ok=True)
+    if fmt == 'parquet':
+        pq.write_table(table, os.path.join(path, 'part-0.parquet'), compression='zstd')
+    else:
+        with pa.OSFile(os.path.join(path, 'part-0.arrow'), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def export(out, workers, fmt):
+    """Export every evaluation and submission into per-task columnar partitions"""
+    import boto3
+    from botocore.config import Config
+
+    s3 = boto3.client('s3', config=Config(max_pool_connections=workers))
+    started = time.monotonic()
+
+    for kind in KINDS:
+        keys = list_result_keys(s3, kind)
+        print(f"📥 {kind}: {len(keys)} objects")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            rows = [row for row in pool.map(lambda key: fetch_row(s3, kind, key), keys) if row]
+
+        by_task = {}
+        for row in rows:
+            by_task.setdefault(row['task_id'], []).append(row)
+
+        for task_id, task_rows in sorted(by_task.items()):
+            # Partition values live in the path, not in the files
+            table = rows_to_table(task_rows).drop(['kind', 'task_id'])
+            write_partition(table, os.path.join(out, f'kind={kind}', f'task_id={task_id}'), fmt)
+            print(f"   {task_id}: {table.num_rows} rows, {table.num_columns} columns")
+
+    print(f"\n✅ Exported to {out} in {time.monotonic() - started:.1f}s")
+
+
+def print_stats(out, fmt):
+    """Print per-task grading statistics from an export"""
+    if not os.path.isdir(out):
+        print(f"❌ Error: No export found at {out}")
+        sys.exit(1)
+
+    started = time.monotonic()
+    dataset = ds.dataset(out, format='parquet' if fmt == 'parquet' else 'arrow', partitioning='hive')
+
+    for kind in KINDS:
+        print(f"\n=== {kind} ===")
+        print(f"{'Task':<10} {'Rows':>6} {'Students':>9} {'Mean':>7} {'Max':>5}  Lowest pass rates")
+        for fragment in sorted(dataset.get_fragments(filter=pc.field('kind') == kind), key=lambda f: f.path):
+            table = fragment.to_table()
+            task_id = ds.get_partition_keys(fragment.partition_expression).get('task_id')
+            rates = []
+            for name in table.column_names:
+                column = table[name]
+                if name.startswith(RESULT_COLUMN_PREFIX) and pa.types.is_boolean(column.type):
+                    rate = pc.mean(column.cast(pa.int8())).as_py()
+                    if rate is not None:
+                        rates.append((rate, name[len(RESULT_COLUMN_PREFIX):]))
+            weakest = ', '.join(f"{criterion} {rate:.0%}" for rate, criterion in sorted(rates)[:3])
+            print(f"{task_id:<10} {table.num_rows:>6} {len(pc.unique(table['student_id'])):>9} "
+                  f"{pc.mean(table['score']).as_py() or 0:>7.1f} {pc.max(table['score']).as_py() or 0:>5}  {weakest}")
+
+    print(f"\nLoaded in {(time.monotonic() - started) * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export evaluations and submissions to Parquet/Arrow')
+    parser.add_argument('--out', default='results-export', help='Output directory')
+    parser.add_argument('--workers', type=int, default=32, help='Parallel S3 GETs')
+    parser.add_argument('--format', choices=['parquet', 'arrow'], default='parquet')
+    parser.add_argument('--stats', action='store_true', help='Print grading statistics from an existing export')
+    args = parser.parse_args()
+
+    if args.stats:
+        print_stats(args.out, args.format)
+    else:
+        export(args.out, args.workers, args.format)
+        print_stats(args.out, args.format)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Evaluator Metrics Report
+Reads the CloudWatch Embedded Metric Format records the evaluator and submitter write to their logs
+and prints throughput per minute, latency percentiles and histograms, and per-evaluation counts,
+by task and phase
+
+Usage:
+    python3 metrics-report.py evaluator.log [submitter.log ...] [--task task-01] [--phase snapshot]
+                              [--metric EvaluationDuration] [--all-tasks] [--histograms]
+    aws logs tail /aws/lambda/k8s-evaluation-function --since 1h | python3 metrics-report.py -
+
+Lines may carry prefixes (timestamps, request IDs): each record is read from its '{"_aws"' onwards.
+"""
+
+import argparse
+import json
+import math
+import sys
+from datetime import datetime
+
+EMF_MARKER = '{"_aws"'
+
+# Histogram bucket upper bounds (ms); the last bucket is unbounded
+HISTOGRAM_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+HISTOGRAM_WIDTH = 40
+
+# Count metrics whose per-minute rate is reported as throughput
+THROUGHPUT_METRICS = ('Evaluations', 'Submissions')
+
+
+def read_records(paths):
+    """EMF records from log files ('-' for stdin)"""
+    decoder = json.JSONDecoder()
+    records = []
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path)
+        try:
+            for line in f:
+                start = line.find(EMF_MARKER)
+                if start < 0:
+                    continue
+                try:
+                    record, _ = decoder.raw_decode(line, start)
+                except json.JSONDecodeError:
+                    continue
+                records.append(record)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+    return records
+
+
+def collect(records, args):
+    """Values per (metric, unit, task_id, phase) and throughput counts per (metric, task_id, minute)"""
+    series, throughput = {}, {}
+    for record in records:
+        task_id = '*' if args.all_tasks else record.get('task_id', '-')
+        phase = record.get('phase', '-')
+        if (args.task and record.get('task_id') != args.task) or (args.phase and phase != args.phase):
+            continue
+        minute = record['_aws'].get('Timestamp', 0) // 60000
+        for directive in record['_aws'].get('CloudWatchMetrics', []):
+            for metric in directive.get('Metrics', []):
+                name = metric['Name']
+                if name not in record or (args.metric and name != args.metric):
+                    continue
+                values = record[name] if isinstance(record[name], list) else [record[name]]
+                series.setdefault((name, metric.get('Unit', 'None'), task_id, phase), []).extend(values)
+                if name in THROUGHPUT_METRICS:
+                    counts = throughput.setdefault((name, task_id), {})
+                    counts[minute] = counts.get(minute, 0) + sum(values)
+    return series, throughput
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def print_throughput(throughput):
+    print(f"\n{'Throughput':<14} {'Task':<12} {'Total':>7} {'Minutes':>8} {'Mean/min':>9} {'Peak/min':>9}  Window")
+    for (name, task_id), counts in sorted(throughput.items()):
+        first, last = min(counts), max(counts)
+        minutes = last - first + 1
+        window = (f"{datetime.utcfromtimestamp(first * 60):%Y-%m-%d %H:%M}"
+                  f" - {datetime.utcfromtimestamp(last * 60 + 59):%H:%M} UTC")
+        print(f"{name:<14} {task_id:<12} {sum(counts.values()):>7.0f} {minutes:>8} "
+              f"{sum(counts.values()) / minutes:>9.1f} {max(counts.values()):>9.0f}  {window}")
+
+
+def print_latencies(series, histograms):
+    rows = sorted((key, values) for key, values in series.items() if key[1] == 'Milliseconds')
+    if not rows:
+        return
+    print(f"\n{'Latency (ms)':<20} {'Task':<12} {'Phase':<28} {'Count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'Max':>9}")
+    for (name, _, task_id, phase), values in rows:
+        print(f"{name:<20} {task_id:<12} {phase[:28]:<28} {len(values):>6} {percentile(values, 0.5):>9.1f} "
+              f"{percentile(values, 0.95):>9.1f} {percentile(values, 0.99):>9.1f} {max(values):>9.1f}")
+        if histograms:
+            print_histogram(values)
+
+
+def print_histogram(values):
+    """Counts per latency bucket, as bars scaled to the fullest bucket"""
+    counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    for value in values:
+        counts[next((i for i, bound in enumerate(HISTOGRAM_BOUNDS) if value <= bound), len(HISTOGRAM_BOUNDS))] += 1
+    used = [i for i, count in enumerate(counts) if count]
+    peak = max(counts)
+    for i in range(used[0], used[-1] + 1):
+        label = f"<= {HISTOGRAM_BOUNDS[i]}" if i < len(HISTOGRAM_BOUNDS) else f"> {HISTOGRAM_BOUNDS[-1]}"
+        bar = '#' * math.ceil(counts[i] / peak * HISTOGRAM_WIDTH) if counts[i] else ''
+        print(f"{'':<24}{label:>10} ms {counts[i]:>6}  {bar}")
+
+
+def print_counts(series):
+    rows = sorted((key, values) for key, values in series.items()
+                  if key[1] == 'Count' and key[0] not in THROUGHPUT_METRICS)
+    if not rows:
+        return
+    print(f"\n{'Counts':<20} {'Task':<12} {'Phase':<28} {'Records':>7} {'Total':>8} {'Mean':>8} {'p95':>7} {'Max':>7}")
+    for (name, _, task_id, phase), values in rows:
+        print(f"{name:<20} {task_id:<12} {phase[:28]:<28} {len(values):>7} {sum(values):>8.0f} "
+              f"{sum(values) / len(values):>8.2f} {percentile(values, 0.95):>7.0f} {max(values):>7.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Aggregate evaluator/submitter EMF metric logs into histograms')
+    parser.add_argument('logs', nargs='+', help="Log files with EMF records ('-' for stdin)")
+    parser.add_argument('--task', help='Only this task')
+    parser.add_argument('--phase', help='Only this phase (e.g. evaluation, snapshot, test_runner.create_pod)')
+    parser.add_argument('--metric', help='Only this metric (e.g. EvaluationDuration, S3WriteLatency)')
+    parser.add_argument('--all-tasks', action='store_true', help='Aggregate each phase over all tasks')
+    parser.add_argument('--histograms', action='store_true', help='Show a latency histogram under each row')
+    args = parser.parse_args()
+
+    records = read_records(args.logs)
+    series, throughput = collect(records, args)
+    if not series:
+        print(f"❌ No matching metrics in {len(records)} EMF records")
+        sys.exit(1)
+
+    print(f"📊 {len(records)} metric records")
+    if throughput:
+        print_throughput(throughput)
+    print_latencies(series, args.histograms)
+    print_counts(series)
+
+
+if __name__ == '__main__':
+    main()
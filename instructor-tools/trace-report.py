@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Evaluation Trace Report for Instructors
+Aggregates the evaluation traces stored under traces/{student_id}/{task_id}/ across a cohort and
+prints, per span (kube API route, test-runner phase, log fetch, S3 call, scoring step), its count,
+p50/p95/max duration and share of total time, slowest first
+
+Usage:
+    python3 trace-report.py [--task task-01] [--student S1] [--workers 32] [--top 25]
+    python3 trace-report.py --files trace.json traces-dir/ ...   # also reports with an embedded trace
+    python3 trace-report.py --otlp traces.json   # also write the traces as OTLP/JSON
+
+Requires: pip install boto3 (not needed with --files)
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+FRAMEWORK_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_BUCKET = os.environ.get('RESULTS_BUCKET', 'k8s-eval-results')
+
+
+def list_trace_keys(s3, task_id=None, student_id=None):
+    """List evaluation trace keys, optionally for one task and/or student"""
+    keys = []
+    paginator = s3.get_paginator('list_objects_v2')
+    prefix = f'traces/{student_id}/' if student_id else 'traces/'
+    for page in paginator.paginate(Bucket=RESULTS_BUCKET, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            # traces/{student_id}/{task_id}/{timestamp}.json
+            parts = obj['Key'].split('/')
+            if obj['Key'].endswith('.json') and len(parts) == 4 and (not task_id or parts[2] == task_id):
+                keys.append(obj['Key'])
+    return keys
+
+
+def load_s3_traces(task_id, student_id, workers):
+    import boto3
+    from botocore.config import Config
+
+    s3 = boto3.client('s3', config=Config(max_pool_connections=workers))
+    keys = list_trace_keys(s3, task_id, student_id)
+    print(f"📥 {len(keys)} traces")
+
+    def fetch(key):
+        try:
+            return json.loads(s3.get_object(Bucket=RESULTS_BUCKET, Key=key)['Body'].read())
+        except Exception as e:
+            print(f"⚠️  Skipping {key}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [trace for trace in pool.map(fetch, keys) if trace]
+
+
+def load_file_traces(paths):
+    """Traces from JSON files, or every *.json under directories (and older reports' embedded traces)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith('.json'))
+        else:
+            files.append(path)
+
+    traces = []
+    for path in files:
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('trace'):
+            data = dict(data['trace'], student_id=data.get('student_id'), task_id=data.get('task_id'))
+        if data.get('spans') is not None:
+            traces.append(data)
+    return traces
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def aggregate(traces):
+    """Span durations grouped by (kind, name)"""
+    durations = {}
+    for trace in traces:
+        for span in trace['spans']:
+            durations.setdefault((span['kind'], span['name']), []).append(span['duration_ms'])
+    return durations
+
+
+def print_report(traces, top):
+    durations = aggregate(traces)
+    # Share of time is measured against the evaluations' own duration, so nested spans add up to it
+    total = sum(durations.get(('evaluation', 'evaluation'), [])) or 1
+    errors = sum(1 for trace in traces for span in trace['spans'] if span['status'] == 'error')
+    dropped = sum(trace.get('dropped_spans', 0) for trace in traces)
+
+    print(f"\n{len(traces)} traces, {sum(len(values) for values in durations.values())} spans, "
+          f"{errors} errored" + (f", {dropped} dropped" if dropped else ""))
+    print(f"{'Kind':<12} {'Span':<58} {'Count':>6} {'p50':>9} {'p95':>9} {'Max':>9} {'Share':>6}")
+    rows = sorted(durations.items(), key=lambda item: -sum(item[1]))
+    for (kind, name), values in rows[:top]:
+        print(f"{kind:<12} {name[:58]:<58} {len(values):>6} {percentile(values, 0.5):>7.1f}ms "
+              f"{percentile(values, 0.95):>7.1f}ms {max(values):>7.1f}ms {sum(values) / total:>6.0%}")
+
+
+def write_otlp(traces, path):
+    """Write the traces as one OTLP/JSON ExportTraceServiceRequest"""
+    sys.path.insert(0, os.path.join(FRAMEWORK_ROOT, 'evaluation', 'lambda'))
+    from tracing import Trace
+
+    resource_spans = [span for trace in traces for span in Trace.resume(trace).to_otlp()['resourceSpans']]
+    with open(path, 'w') as f:
+        json.dump({'resourceSpans': resource_spans}, f)
+    print(f"\n✅ Wrote {len(traces)} traces to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find the slowest evaluation phases across a cohort')
+    parser.add_argument('--task', help='Only evaluations of this task')
+    parser.add_argument('--student', help='Only evaluations of this student')
+    parser.add_argument('--files', nargs='+', help='Read traces from JSON files/directories instead of S3')
+    parser.add_argument('--workers', type=int, default=32, help='Parallel S3 GETs')
+    parser.add_argument('--top', type=int, default=25, help='Spans to show')
+    parser.add_argument('--otlp', help='Also write the traces as OTLP/JSON to this file')
+    args = parser.parse_args()
+
+    if args.files:
+        traces = [trace for trace in load_file_traces(args.files)
+                  if (not args.task or trace.get('task_id') == args.task)
+                  and (not args.student or trace.get('student_id') == args.student)]
+    else:
+        traces = load_s3_traces(args.task, args.student, args.workers)
+
+    if not traces:
+        print("❌ No traced evaluations found")
+        sys.exit(1)
+
+    print_report(traces, args.top)
+    if args.otlp:
+        write_otlp(traces, args.otlp)
+
+
+if __name__ == '__main__':
+    main()
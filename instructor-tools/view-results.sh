@@ -16,16 +16,30 @@ if ! aws s3 ls "s3://${RESULTS_BUCKET}" 2>/dev/null; then
     exit 1
 fi
 
+# Print an index object (index/students/*.json, index/tasks/*.json) kept up to date by the
+# evaluator and submitter Lambdas; fails if the index has no entry yet
+show_index() {
+    local KEY="$1" FILTER="$2"
+    local INDEX
+    INDEX=$(aws s3 cp "s3://${RESULTS_BUCKET}/${KEY}" - 2>/dev/null) || return 1
+    if command -v jq >/dev/null 2>&1; then
+        echo "${INDEX}" | jq -r "${FILTER}"
+    else
+        echo "${INDEX}"
+    fi
+}
+
 # Menu
 echo "What would you like to view?"
 echo ""
 echo "  1. All submissions"
-echo "  2. Submissions by Neptun Code"
-echo "  3. Submissions by Task"
+echo "  2. Results by Neptun Code"
+echo "  3. Leaderboard by Task"
 echo "  4. Latest evaluations"
 echo "  5. Download all results"
+echo "  6. Export results for analytics (Parquet, per-task statistics)"
 echo ""
-read -p "Choose option (1-5): " OPTION
+read -p "Choose option (1-6): " OPTION
 
 case $OPTION in
     1)
@@ -38,17 +52,28 @@ case $OPTION in
         echo ""
         read -p "Enter Neptun Code: " NEPTUN
         echo ""
-        echo "=== Submissions for ${NEPTUN} ==="
+        echo "=== Results for ${NEPTUN} ==="
         echo ""
-        aws s3 ls "s3://${RESULTS_BUCKET}/submissions/" --recursive | grep -i "${NEPTUN}" || echo "No submissions found"
+        show_index "index/students/${NEPTUN}.json" \
+            '(["TASK", "EVALUATED", "SCORE", "BEST", "SUBMITTED", "SUBMITTED_SCORE"] | @tsv),
+             (.tasks | to_entries[] | [.key, (.value.evaluation.timestamp // "-"),
+              (.value.evaluation.score // "-"), (.value.best_score // "-"),
+              (.value.submission.timestamp // "-"), (.value.submission.score // "-")] | @tsv)' \
+            || aws s3 ls "s3://${RESULTS_BUCKET}/submissions/" --recursive | grep -i "${NEPTUN}" \
+            || echo "No submissions found"
         ;;
     3)
         echo ""
         read -p "Enter Task ID (e.g., task-01): " TASK
         echo ""
-        echo "=== Submissions for ${TASK} ==="
+        echo "=== Leaderboard for ${TASK} ==="
         echo ""
-        aws s3 ls "s3://${RESULTS_BUCKET}/submissions/" --recursive | grep "${TASK}" || echo "No submissions found"
+        show_index "index/tasks/${TASK}.json" \
+            '(["RANK", "STUDENT", "SCORE", "SUBMITTED"] | @tsv),
+             (.leaderboard | to_entries[] | [.key + 1, .value.student_id,
+              "\(.value.score)/\(.value.max_score)", .value.submitted] | @tsv)' \
+            || aws s3 ls "s3://${RESULTS_BUCKET}/submissions/" --recursive | grep "${TASK}" \
+            || echo "No submissions found"
         ;;
     4)
         echo ""
@@ -62,7 +87,8 @@ case $OPTION in
         mkdir -p "${DOWNLOAD_DIR}"
 
         echo "Downloading all results to: ${DOWNLOAD_DIR}"
-        aws s3 sync "s3://${RESULTS_BUCKET}/" "${DOWNLOAD_DIR}/" --region ${REGION}
+        # Traces are only needed by trace-report.py, which reads them from S3
+        aws s3 sync "s3://${RESULTS_BUCKET}/" "${DOWNLOAD_DIR}/" --exclude "traces/*" --region ${REGION}
 
         echo ""
         echo "✅ Results downloaded to: ${DOWNLOAD_DIR}"
@@ -87,6 +113,15 @@ EOF
         echo ""
         cat "${DOWNLOAD_DIR}/summary.txt"
         ;;
+    6)
+        echo ""
+        EXPORT_DIR="./results-export-$(date +%Y%m%d-%H%M%S)"
+        SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+        RESULTS_BUCKET="${RESULTS_BUCKET}" python3 "${SCRIPT_DIR}/export-results.py" --out "${EXPORT_DIR}"
+        echo ""
+        echo "Reload statistics later with:"
+        echo "  python3 ${SCRIPT_DIR}/export-results.py --stats --out ${EXPORT_DIR}"
+        ;;
     *)
         echo "Invalid option"
         exit 1
@@ -1,16 +1,42 @@
 import json
 import boto3
 import os
+import time
+from contextlib import contextmanager
 from datetime import datetime
 import jwt
 
+# Packaged from evaluation/lambda: token encoding, the result index and metrics are shared with the evaluator
+from eval_token import expand_token_claims, token_schema_key
+from metrics import METRICS_ENABLED, emit_records, metric_record
+from result_index import index_updates, set_index_deadline, update_index_object
+
 s3 = boto3.client('s3')
 BUCKET_NAME = 'k8s-eval-results'
 
 # JWT Secret for validating evaluation tokens (must match evaluator secret)
 JWT_SECRET = os.environ.get('JWT_SECRET', os.environ.get('API_KEY', 'default-secret-change-me'))
 
+# Compact (version 2) evaluation tokens carry results as bitmaps over the result keys the evaluator
+# stores once per spec version under token-schemas/{task_id}/{spec_hash}.json (immutable, cached here)
+TOKEN_SCHEMA_CACHE = {}
+
+# S3 write latencies of the invocation being handled, reported in its metric records
+S3_WRITE_LATENCIES = []
+
 def lambda_handler(event, context):
+    """
+    Handle final submission from student, emitting its metrics
+    """
+    started = time.perf_counter()
+    S3_WRITE_LATENCIES.clear()
+    set_index_deadline(context)
+    response = handle_submission(event)
+    emit_submission_metrics(event, response, (time.perf_counter() - started) * 1000)
+    return response
+
+
+def handle_submission(event):
     """
     Handle final submission from student
     Requires: eval_token (from previous evaluation)
@@ -59,6 +85,8 @@ def lambda_handler(event, context):
         # Decode and validate JWT token
         try:
             eval_data = jwt.decode(eval_token, JWT_SECRET, algorithms=['HS256'])
+            if eval_data.get('v') == 2:
+                eval_data = expand_compact_token(eval_data)
             print(f"JWT token decoded successfully for {eval_data.get('student_id')}")
         except jwt.ExpiredSignatureError:
             return {
@@ -108,7 +136,8 @@ def lambda_handler(event, context):
         
         # Store in submissions folder (consistent with evaluations path structure)
         submission_key = f'submissions/{student_id}/{task_id}/{submission_timestamp}.json'
-        s3.put_object(
+        put_object_timed(
+            's3 PUT submissions',
             Bucket=BUCKET_NAME,
             Key=submission_key,
             Body=json.dumps(submission, indent=2),
@@ -116,6 +145,14 @@ def lambda_handler(event, context):
         )
         
         print(f"Submission recorded: {submission_key}")
+
+        update_result_index(student_id, task_id, {
+            'timestamp': submission_timestamp,
+            'score': eval_data['score'],
+            'max_score': eval_data.get('max_score', 100),
+            'key': submission_key,
+            'evaluated_at': eval_data.get('timestamp')
+        })
         
         return {
             'statusCode': 200,
@@ -139,4 +176,76 @@ def lambda_handler(event, context):
                 'error': 'Internal submission error',
                 'details': str(e)
             })
-        }
\ No newline at end of file
+        }
+
+
+def expand_compact_token(claims):
+    """Expand verified version 2 claims with the token schema, or from the stored evaluation report"""
+    try:
+        return expand_token_claims(claims, load_token_schema(claims['tid'], claims['sh']))
+    except Exception as e:
+        print(f"Token schema unavailable ({e}), reading results from the evaluation report")
+
+    report_key = f"evaluations/{claims['sid']}/{claims['tid']}/{claims['ts']}.json"
+    report = json.loads(s3.get_object(Bucket=BUCKET_NAME, Key=report_key)['Body'].read())
+    return dict(expand_token_claims(claims, None), results=report['results'])
+
+
+def load_token_schema(task_id, spec_hash):
+    """Result keys a spec version's tokens are encoded against"""
+    if (task_id, spec_hash) not in TOKEN_SCHEMA_CACHE:
+        response = s3.get_object(Bucket=BUCKET_NAME, Key=token_schema_key(task_id, spec_hash))
+        TOKEN_SCHEMA_CACHE[(task_id, spec_hash)] = json.loads(response['Body'].read())['result_keys']
+    return TOKEN_SCHEMA_CACHE[(task_id, spec_hash)]
+
+
+def update_result_index(student_id, task_id, record):
+    """Record a submission in the task leaderboard and the student's index"""
+    try:
+        for key, merge in index_updates([(student_id, task_id, 'submission', record)]):
+            update_index_object(s3, BUCKET_NAME, key, merge, timed_s3_write)
+    except Exception as e:
+        # The index is derived data: never fail a submission over it
+        print(f"Error updating result index: {e}")
+
+
+@contextmanager
+def timed_s3_write(phase, **attributes):
+    """Record an S3 PUT's latency for this invocation's metrics (reads are not recorded)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if phase.startswith('s3 PUT'):
+            S3_WRITE_LATENCIES.append((phase, (time.perf_counter() - started) * 1000))
+
+
+def put_object_timed(phase, **params):
+    """put_object, recording its latency for this invocation's metrics"""
+    with timed_s3_write(phase):
+        return s3.put_object(**params)
+
+
+def emit_submission_metrics(event, response, duration_ms):
+    """Write a submission's metric records to stdout; never raises"""
+    if not METRICS_ENABLED:
+        return
+    try:
+        body = event.get('body', event)
+        body = json.loads(body) if isinstance(body, str) else body
+        task_id = str(body.get('task_id') or 'unknown')
+        status_code = response['statusCode']
+        records = [metric_record(task_id, 'submission', {
+            'Submissions': 1,
+            'SubmissionRejections': int(400 <= status_code < 500),
+            'SubmissionErrors': int(status_code >= 500),
+            'SubmissionDuration': round(duration_ms, 2),
+        }, status_code=status_code)]
+        latencies = {}
+        for phase, latency_ms in S3_WRITE_LATENCIES:
+            latencies.setdefault(phase, []).append(round(latency_ms, 2))
+        records += [metric_record(task_id, phase, {'S3WriteLatency': values}) for phase, values in latencies.items()]
+    except Exception as e:
+        print(f"Metric emission failed: {e}")
+        return
+    emit_records(records)